@@ -3,9 +3,19 @@ import hashlib
 import logging
 import os
 import re
-from typing import Callable, Literal, TypeAlias, cast
+import secrets
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Callable, Literal, TypeAlias
+from urllib.parse import quote_plus, urlencode
 
 import requests
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
 
 from splatnet3_scraper import __version__
 from splatnet3_scraper.auth.exceptions import (
@@ -17,14 +27,205 @@ from splatnet3_scraper.constants import (
     APP_VERSION_FALLBACK,
     DEFAULT_USER_AGENT,
     IOS_APP_URL,
+    NSO_VERSION_ENV_VAR,
     NXAPI_ZNCA_URL,
     SPLATNET_URL,
 )
-from splatnet3_scraper.utils import get_splatnet_version, retry
+from splatnet3_scraper.utils import (
+    get_splatnet_version,
+    read_cache,
+    retry,
+    write_cache,
+)
+
+logger = logging.getLogger(__name__)
+
+# The login flow talks to several Nintendo hosts, so keep a pooled keep-alive
+# connection per host and retry transient gateway errors at the transport level
+# before they surface as exceptions. The adapter is shared by every session
+# created through ``NSO.new_instance`` so that separate instances reuse the
+# same connections, while each session still keeps its own cookies.
+_https_adapter = requests.adapters.HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=8,
+    max_retries=Retry(
+        total=2,
+        backoff_factor=0.2,
+        status_forcelist=(502, 503, 504),
+    ),
+)
 
 version_re = re.compile(
     r"(?<=whats\-new\_\_latest\_\_version\"\>Version)\s+\d+\.\d+\.\d+"
 )
+session_token_code_re = re.compile(r"[?#&]session_token_code=([^&#]+)")
+
+# The App Store page is streamed in chunks of this size and only scanned up to
+# the version string. The tail of the previous chunk is kept so that a match
+# split across two chunks is still found.
+VERSION_CHUNK_SIZE = 1 << 16
+VERSION_CHUNK_OVERLAP = 1 << 10
+NSO_VERSION_TTL = 24 * 60 * 60
+NSO_VERSION_CACHE_NAME = "nso_version.json"
+
+# User agent sent to the f-token generation server. This only depends on the
+# package version, so it is built once at import time.
+FTOKEN_USER_AGENT = f"splatnet3_scraper/{__version__}"
+
+# Static parts of the request headers and parameters used during the login
+# flow. These are read-only so they can be shared between calls, and each
+# request only overlays the handful of values that actually change.
+# Content-Length is left out on purpose, requests always sets it from the
+# actual body when the request is prepared.
+_LOGIN_HEADERS = MappingProxyType(
+    {
+        "Host": "accounts.nintendo.com",
+        "Connection": "keep-alive",
+        "Cache-Control": "max-age=0",
+        "Upgrade-Insecure-Requests": "1",
+        "Accept": (
+            "text/html,"
+            "application/xhtml+xml,"
+            "application/xml;q=0.9,"
+            "image/webp,"
+            "image/apng,"
+            "*/*;q=0.8n"
+        ),
+        "DNT": "1",
+        "Accept-Encoding": "gzip,deflate,br",
+    }
+)
+_LOGIN_QUERY = urlencode(
+    {
+        "redirect_uri": "npf71b963c1b7b6d119://auth",
+        "client_id": "71b963c1b7b6d119",
+        "scope": "openid user user.birthday user.mii user.screenName",
+        "response_type": "session_token_code",
+        "session_token_code_challenge_method": "S256",
+        "theme": "login_form",
+    }
+)
+_SESSION_TOKEN_HEADERS = MappingProxyType(
+    {
+        "Accept-Language": "en-US",
+        "Accept": "application/json",
+        "Content-Type": "application/x-www-form-urlencoded",
+        "Host": "accounts.nintendo.com",
+        "Connection": "Keep-Alive",
+        "Accept-Encoding": "gzip",
+    }
+)
+_USER_ACCESS_TOKEN_HEADERS = MappingProxyType(
+    {
+        "Host": "accounts.nintendo.com",
+        "Accept-Encoding": "gzip",
+        "Content-Type": "application/json",
+        "Accept": "application/json",
+        "Connection": "Keep-Alive",
+        "User-Agent": (
+            "Dalvik/2.1.0 "
+            "(Linux; U; Android 14; Pixel 7a Build/UQ1A.240105.004)"
+        ),
+    }
+)
+_USER_INFO_HEADERS = MappingProxyType(
+    {
+        "User-Agent": "NASDKAPI; Android",
+        "Content-Type": "application/json",
+        "Accept": "application/json",
+        "Host": "api.accounts.nintendo.com",
+        "Connection": "Keep-Alive",
+        "Accept-Encoding": "gzip",
+    }
+)
+_FTOKEN_HEADERS = MappingProxyType(
+    {
+        "User-Agent": FTOKEN_USER_AGENT,
+        "Content-Type": "application/json; charset=utf-8",
+        "X-znca-Platform": "Android",
+    }
+)
+_WEB_SERVICE_ACCESS_TOKEN_HEADERS = MappingProxyType(
+    {
+        "X-Platform": "Android",
+        "Content-Type": "application/json; charset=utf-8",
+        "Connection": "Keep-Alive",
+        "Accept-Encoding": "gzip",
+    }
+)
+_GTOKEN_REQUEST_HEADERS = MappingProxyType(
+    {
+        "X-Platform": "Android",
+        "Content-Type": "application/json; charset=utf-8",
+        "Accept-Encoding": "gzip",
+    }
+)
+_BULLET_TOKEN_HEADERS = MappingProxyType(
+    {
+        "Content-Type": "application/json",
+        "Accept": "*/*",
+        "Origin": SPLATNET_URL,
+        "X-Requested-With": "com.nintendo.znca",
+    }
+)
+
+
+@lru_cache(maxsize=8)
+def _code_challenge(verifier: bytes) -> bytes:
+    """Computes the S256 code challenge for a code verifier. The verifier is
+    stable for the lifetime of a login flow, so the challenge is cached per
+    verifier instead of being hashed again on every call.
+
+    Args:
+        verifier (bytes): The code verifier.
+
+    Returns:
+        bytes: The base64url encoded SHA-256 digest of the verifier, without
+            padding.
+    """
+    digest = hashlib.sha256(verifier).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=")
+
+
+def _post_json(
+    session: requests.Session,
+    url: str,
+    headers: dict[str, str],
+    body: dict,
+) -> requests.Response:
+    """Sends a POST request with a JSON body. The body is encoded with
+    ``orjson`` when it is installed, otherwise ``requests`` encodes it with the
+    standard library. Every caller already sets the ``Content-Type`` header.
+
+    Args:
+        session (requests.Session): The session to send the request with.
+        url (str): The URL to send the request to.
+        headers (dict[str, str]): The request headers.
+        body (dict): The JSON body of the request.
+
+    Returns:
+        requests.Response: The response from the server.
+    """
+    if orjson is not None:
+        return session.post(url, headers=headers, data=orjson.dumps(body))
+    return session.post(url, headers=headers, json=body)
+
+
+def _response_json(response: requests.Response) -> Any:
+    """Decodes the JSON body of a response. The raw bytes are decoded with
+    ``orjson`` when it is installed, skipping the intermediate ``str`` that
+    ``response.json()`` builds.
+
+    Args:
+        response (requests.Response): The response to decode.
+
+    Returns:
+        Any: The decoded JSON body.
+    """
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
 
 FToken_Gen: TypeAlias = Callable[
     [str, str, Literal[1] | Literal[2], str, str | None],
@@ -32,6 +233,19 @@ FToken_Gen: TypeAlias = Callable[
 ]
 
 
+def _read_cached_version() -> str | None:
+    """Reads the NSO app version cached on disk by ``NSO.get_version``.
+
+    Returns:
+        str | None: The cached version, or None if there is no fresh cached
+            version.
+    """
+    cached = read_cache(NSO_VERSION_CACHE_NAME, NSO_VERSION_TTL)
+    if isinstance(cached, dict) and isinstance(cached.get("version"), str):
+        return cached["version"]
+    return None
+
+
 class NSO:
     """The NSO class contains all the logic to proceed through the login flow.
     This class also holds various properties that are used to make requests to
@@ -79,6 +293,22 @@ class NSO:
     handles the persistence of the tokens to disk.
     """
 
+    __slots__ = (
+        "session",
+        "_state",
+        "_verifier",
+        "_version",
+        "_web_view_version",
+        "_session_token",
+        "_user_access_token",
+        "_id_token",
+        "_nintendo_account_id",
+        "_coral_user_id",
+        "_gtoken",
+        "_user_info",
+        "_f_token_function",
+    )
+
     def __init__(self, session: requests.Session) -> None:
         """Initializes the NSO class. The NSO class contains all the logic and
         holds all the necessary values to proceed through the login flow.
@@ -146,7 +376,6 @@ class NSO:
         self._gtoken: str | None = None
         self._user_info: dict[str, str] | None = None
         self._f_token_function: FToken_Gen = self.get_ftoken
-        self.logger = logging.getLogger(__name__)
 
     @staticmethod
     def new_instance() -> "NSO":
@@ -156,11 +385,14 @@ class NSO:
         as it ensures that the session is a fresh session, however it is not
         absolutely necessary to instantiate a new NSO class using this method.
         Passing in a new session to the ``__init__`` method is perfectly fine.
+        Sessions created here share one HTTPS connection pool, so creating
+        several instances does not pay for new TLS handshakes each time.
 
         Returns:
             NSO: A new instance of the NSO class.
         """
         session = requests.Session()
+        session.mount("https://", _https_adapter)
         return NSO(session=session)
 
     @property
@@ -168,17 +400,24 @@ class NSO:
         """Returns the current version of the NSO app. Necessary to get the
         session token. If the version has not been obtained yet, it will be
         obtained and stored. If the version cannot be obtained, a fallback
-        version will be used.
+        version will be used. The ``SN3S_NSO_VERSION`` environment variable
+        can be set to override the version without any I/O. Otherwise, a
+        version cached on disk by ``get_version`` is used if it is still fresh.
+        The App Store is not scraped from here.
 
         Returns:
             str: The current version of the NSO app.
         """
         if self._version is None:
             # self._version = self.get_version()
-            self._version = "2.10.1"
+            self._version = (
+                os.environ.get(NSO_VERSION_ENV_VAR)
+                or _read_cached_version()
+                or APP_VERSION_FALLBACK
+            )
         return self._version
 
-    @retry(times=2, exceptions=ValueError)
+    @retry(times=2, exceptions=ValueError, delays=(0.2, 0.5))
     def get_version(self) -> str:
         """Fetches the current version of the Nintendo Switch Online app from
         the iOS app store. This is necessary to access the API. This method
@@ -187,19 +426,41 @@ class NSO:
         three attempts, a fallback version defined in the ``constants.py`` file
         will be used.
 
+        A successfully scraped version is cached on disk for 24 hours, so the
+        App Store is scraped at most once a day across processes. See
+        ``get_cache_dir`` for the location of the cache.
+
         Returns:
             str: The current version of the NSO app.
         """
+        cached = _read_cached_version()
+        if cached is not None:
+            return cached
+
         # TODO: Replace the iOS app store method with a method that does not
         # require scraping a website with scraping protection.
-        response = self.session.get(IOS_APP_URL)
-        version = version_re.search(response.text)
+        # Stream the page and stop at the first match, rather than
+        # downloading and decoding the whole page through ``response.text``
+        response = self.session.get(IOS_APP_URL, stream=True)
+        version = None
+        buffer = b""
+        try:
+            for chunk in response.iter_content(chunk_size=VERSION_CHUNK_SIZE):
+                buffer = buffer[-VERSION_CHUNK_OVERLAP:] + chunk
+                version = version_re.search(buffer.decode("utf-8", "replace"))
+                if version is not None:
+                    break
+        finally:
+            response.close()
+
         if version is None:
-            self.logger.warning(
+            logger.warning(
                 "Failed to get version from app store, using fallback"
             )
             return APP_VERSION_FALLBACK
-        return version.group(0).strip()
+        app_version = version.group(0).strip()
+        write_cache(NSO_VERSION_CACHE_NAME, {"version": app_version})
+        return app_version
 
     @property
     def state(self) -> bytes:
@@ -224,7 +485,7 @@ class NSO:
             bytes: The auth state, without padding. A random 36 byte string
                 that is base64url encoded.
         """
-        return base64.urlsafe_b64encode(os.urandom(36))
+        return secrets.token_urlsafe(36).encode()
 
     @property
     def verifier(self) -> bytes:
@@ -250,8 +511,19 @@ class NSO:
         Returns:
             bytes: The code verifier, without padding.
         """
-        verifier_ = base64.urlsafe_b64encode(os.urandom(32))
-        return verifier_.replace(b"=", b"")
+        return secrets.token_urlsafe(32).encode()
+
+    @property
+    def challenge(self) -> bytes:
+        """Returns the S256 code challenge for the current code verifier. This
+        is used to generate the login URL. The challenge is computed once per
+        verifier and cached.
+
+        Returns:
+            bytes: The base64url encoded SHA-256 digest of the code verifier,
+                without padding.
+        """
+        return _code_challenge(self.verifier)
 
     @property
     def session_token(self) -> str:
@@ -284,43 +556,25 @@ class NSO:
             str: The login URL that can be used to obtain the session token.
         """
         # https://dev.to/mathewthe2/intro-to-nintendo-switch-rest-api-2cm7
-        hash_ = hashlib.sha256()
-        hash_.update(self.verifier)
-        challenge = base64.urlsafe_b64encode(hash_.digest()).replace(b"=", b"")
+        challenge = self.challenge
 
         header = {
-            "Host": "accounts.nintendo.com",
-            "Connection": "keep-alive",
-            "Cache-Control": "max-age=0",
-            "Upgrade-Insecure-Requests": "1",
+            **_LOGIN_HEADERS,
             "User-Agent": user_agent
             if user_agent is not None
             else DEFAULT_USER_AGENT,
-            "Accept": (
-                "text/html,"
-                + "application/xhtml+xml,"
-                + "application/xml;q=0.9,"
-                + "image/webp,"
-                + "image/apng,"
-                + "*/*;q=0.8n"
-            ),
-            "DNT": "1",
-            "Accept-Encoding": "gzip,deflate,br",
         }
-        params = {
-            "state": self.state,
-            "redirect_uri": "npf71b963c1b7b6d119://auth",
-            "client_id": "71b963c1b7b6d119",
-            "scope": ("openid user user.birthday user.mii user.screenName"),
-            "response_type": "session_token_code",
-            "session_token_code_challenge": challenge,
-            "session_token_code_challenge_method": "S256",
-            "theme": "login_form",
-        }
-        login_url = "https://accounts.nintendo.com/connect/1.0.0/authorize"
-        response = self.session.get(
-            login_url, headers=header, params=params  # type: ignore
+        # Only the state and the challenge change between calls, so only they
+        # are encoded here
+        params = "&".join(
+            (
+                _LOGIN_QUERY,
+                "state=" + quote_plus(self.state),
+                "session_token_code_challenge=" + quote_plus(challenge),
+            )
         )
+        login_url = "https://accounts.nintendo.com/connect/1.0.0/authorize"
+        response = self.session.get(login_url, headers=header, params=params)
         return response.url
 
     def parse_npf_uri(self, uri: str) -> str:
@@ -331,11 +585,19 @@ class NSO:
         Args:
             uri (str): The uri returned by the Nintendo login page.
 
+        Raises:
+            ValueError: If the uri does not contain a session token code.
+
         Returns:
             str: The session token code. This is *NOT* the session token, but is
                 used to obtain the session token.
         """
-        return uri.split("&")[1][len("session_token_code=") :]
+        # Search for the parameter directly rather than relying on its position
+        # in the uri
+        session_token_code = session_token_code_re.search(uri)
+        if session_token_code is None:
+            raise ValueError("The uri does not contain a session token code.")
+        return session_token_code.group(1)
 
     def get_session_token(self, session_token_code: str) -> str:
         """Obtains the session token from the session token code.
@@ -354,14 +616,8 @@ class NSO:
             str: The session token. DO NOT SHARE THIS TOKEN WITH ANYONE.
         """
         header = {
+            **_SESSION_TOKEN_HEADERS,
             "User-Agent": f"OnlineLounge/{self.version} NASDKAPI Android",
-            "Accept-Language": "en-US",
-            "Accept": "application/json",
-            "Content-Type": "application/x-www-form-urlencoded",
-            "Content-Length": "540",
-            "Host": "accounts.nintendo.com",
-            "Connection": "Keep-Alive",
-            "Accept-Encoding": "gzip",
         }
         params = {
             "client_id": "71b963c1b7b6d119",
@@ -370,7 +626,7 @@ class NSO:
         }
         uri = "https://accounts.nintendo.com/connect/1.0.0/api/session_token"
         response = self.session.post(uri, headers=header, data=params)
-        session_token = response.json()["session_token"]
+        session_token = _response_json(response)["session_token"]
         self._session_token = session_token
         return session_token
 
@@ -391,18 +647,7 @@ class NSO:
                 ``access_token`` is used to obtain the user's data, while the
                 ``id_token`` is used to obtain the user's gtoken.
         """
-        header = {
-            "Host": "accounts.nintendo.com",
-            "Accept-Encoding": "gzip",
-            "Content-Type": "application/json",
-            "Content-Length": "436",
-            "Accept": "application/json",
-            "Connection": "Keep-Alive",
-            "User-Agent": (
-                "Dalvik/2.1.0 "
-                "(Linux; U; Android 14; Pixel 7a Build/UQ1A.240105.004)"
-            ),
-        }
+        header = dict(_USER_ACCESS_TOKEN_HEADERS)
         body = {
             "client_id": "71b963c1b7b6d119",
             "session_token": session_token,
@@ -411,7 +656,7 @@ class NSO:
             ),
         }
         uri = "https://accounts.nintendo.com/connect/1.0.0/api/token"
-        return self.session.post(uri, headers=header, json=body).json()
+        return _response_json(_post_json(self.session, uri, header, body))
 
     def get_user_info(self, user_access_token: str) -> dict[str, str]:
         """Obtains the user information from the user access token.
@@ -430,16 +675,11 @@ class NSO:
         # Get user information
         url = "https://api.accounts.nintendo.com/2.0.0/users/me"
         header = {
-            "User-Agent": "NASDKAPI; Android",
-            "Content-Type": "application/json",
-            "Accept": "application/json",
+            **_USER_INFO_HEADERS,
             "Authorization": f"Bearer {user_access_token}",
-            "Host": "api.accounts.nintendo.com",
-            "Connection": "Keep-Alive",
-            "Accept-Encoding": "gzip",
         }
         response = self.session.get(url, headers=header)
-        return response.json()
+        return _response_json(response)
 
     def get_gtoken(
         self, session_token: str, f_token_url: str | None = None
@@ -486,34 +726,34 @@ class NSO:
         """
         f_token_url = f_token_url if f_token_url is not None else NXAPI_ZNCA_URL
         # Get user access token
-        self.logger.info("Getting user access token")
+        logger.info("Getting user access token")
         user_access_response = self.get_user_access_token(session_token)
         try:
-            self._user_access_token = cast(
-                str, user_access_response["access_token"]
-            )
-            self._id_token = cast(str, user_access_response["id_token"])
+            user_access_token: str = user_access_response["access_token"]
+            id_token: str = user_access_response["id_token"]
         except (KeyError, TypeError, AttributeError):
             raise NintendoException(
                 "Failed to get user access token. "
                 + f"Response: {user_access_response}"
             )
 
-        self.logger.info("Getting user info")
-        user_info = self.get_user_info(self._user_access_token)
+        logger.info("Getting user info")
+        self._user_access_token = user_access_token
+        self._id_token = id_token
+        user_info = self.get_user_info(user_access_token)
         self._user_info = user_info
         self._nintendo_account_id = user_info["id"]
-        self.logger.info("Getting Web Service Access Token")
+        logger.info("Getting Web Service Access Token")
         (
             web_service_access_token,
             coral_user_id,
         ) = self.g_token_generation_phase_1(
-            self._id_token,
+            id_token,
             user_info,
             self._nintendo_account_id,
             f_token_url=f_token_url,
         )
-        self.logger.info("Getting gtoken")
+        logger.info("Getting gtoken")
         self._coral_user_id = coral_user_id
         gtoken = self.g_token_generation_phase_2(
             web_service_access_token,
@@ -562,10 +802,10 @@ class NSO:
             ``f_token`` generation method will be restored.
         """
         if new_function is None:
-            self.logger.info("Restoring default ftoken generation method")
+            logger.info("Restoring default ftoken generation method")
             self._f_token_function = self.get_ftoken
         else:
-            self.logger.info("Setting new ftoken generation method")
+            logger.info("Setting new ftoken generation method")
             self._f_token_function = new_function
 
     def get_ftoken(
@@ -634,12 +874,7 @@ class NSO:
             str: The request ID.
             str: The timestamp.
         """
-        header = {
-            "User-Agent": f"splatnet3_scraper/{__version__}",
-            "Content-Type": "application/json; charset=utf-8",
-            "X-znca-Platform": "Android",
-            "X-znca-Version": self.version,
-        }
+        header = {**_FTOKEN_HEADERS, "X-znca-Version": self.version}
         body = {
             "token": id_token,
             "hash_method": step,
@@ -653,8 +888,8 @@ class NSO:
                 "Coral user ID is required for step 2 of ftoken generation"
             )
 
-        response = self.session.post(f_token_url, headers=header, json=body)
-        response_json = response.json()
+        response = _post_json(self.session, f_token_url, header, body)
+        response_json = _response_json(response)
         try:
             f_token = response_json["f"]
             request_id = response_json["request_id"]
@@ -665,7 +900,11 @@ class NSO:
             )
         return (f_token, request_id, timestamp)
 
-    @retry(times=1, exceptions=(FTokenException, NintendoException, KeyError))
+    @retry(
+        times=1,
+        exceptions=(FTokenException, NintendoException, KeyError),
+        delays=(0.2,),
+    )
     def g_token_generation_phase_1(
         self,
         id_token: str,
@@ -712,7 +951,11 @@ class NSO:
             id_token, user_info, f_token, request_id, timestamp
         )
 
-    @retry(times=1, exceptions=(FTokenException, NintendoException, KeyError))
+    @retry(
+        times=1,
+        exceptions=(FTokenException, NintendoException, KeyError),
+        delays=(0.2,),
+    )
     def g_token_generation_phase_2(
         self,
         web_service_access_token: str,
@@ -794,14 +1037,11 @@ class NSO:
             str: The Web Service Credential Access Token.
             str: The coral user ID.
         """
+        version = self.version
         header = {
-            "X-Platform": "Android",
-            "X-ProductVersion": self.version,
-            "Content-Type": "application/json; charset=utf-8",
-            "Content-Length": str(990 + len(f_token)),
-            "Connection": "Keep-Alive",
-            "Accept-Encoding": "gzip",
-            "User-Agent": "com.nintendo.znca/" + self.version + "(Android/14)",
+            **_WEB_SERVICE_ACCESS_TOKEN_HEADERS,
+            "X-ProductVersion": version,
+            "User-Agent": f"com.nintendo.znca/{version}(Android/14)",
         }
         body = {
             "parameter": {
@@ -815,7 +1055,7 @@ class NSO:
             }
         }
         url = "https://api-lp1.znc.srv.nintendo.net/v3/Account/Login"
-        response = self.session.post(url, headers=header, json=body).json()
+        response = _response_json(_post_json(self.session, url, header, body))
         if "result" not in response:
             raise NintendoException(
                 "Failed to get web service access token. "
@@ -865,14 +1105,12 @@ class NSO:
         Returns:
             str: The ``gtoken``.
         """
+        version = self.version
         header = {
-            "X-Platform": "Android",
-            "X-ProductVersion": self.version,
+            **_GTOKEN_REQUEST_HEADERS,
+            "X-ProductVersion": version,
             "Authorization": f"Bearer {web_service_access_token}",
-            "Content-Type": "application/json; charset=utf-8",
-            "Content-Length": "391",
-            "Accept-Encoding": "gzip",
-            "User-Agent": f"com.nintendo.znca/{self.version}(Android/14)",
+            "User-Agent": f"com.nintendo.znca/{version}(Android/14)",
         }
         body = {
             "parameter": {
@@ -884,7 +1122,7 @@ class NSO:
             }
         }
         url = "https://api-lp1.znc.srv.nintendo.net/v2/Game/GetWebServiceToken"
-        response = self.session.post(url, headers=header, json=body).json()
+        response = _response_json(_post_json(self.session, url, header, body))
         if "result" not in response:
             raise NintendoException(
                 "Failed to get gtoken. " + f"Response: {response}"
@@ -948,20 +1186,16 @@ class NSO:
                 to SplatNet 3, and is valid for 6 hours and 30 minutes after it
                 is obtained.
         """
-        self.logger.info("Getting bullet token")
+        logger.info("Getting bullet token")
         user_agent = (
             user_agent if user_agent is not None else DEFAULT_USER_AGENT
         )
         header = {
-            "Content-Length": "0",
-            "Content-Type": "application/json",
+            **_BULLET_TOKEN_HEADERS,
             "Accept-Language": user_info["language"],
             "User-Agent": user_agent,
             "X-Web-View-Ver": self.splatnet_web_version,
             "X-NACOUNTRY": user_info["country"],
-            "Accept": "*/*",
-            "Origin": SPLATNET_URL,
-            "X-Requested-With": "com.nintendo.znca",
         }
         cookies = {
             "_gtoken": gtoken,
@@ -983,7 +1217,7 @@ class NSO:
             )
 
         try:
-            return response.json()["bulletToken"]
+            return _response_json(response)["bulletToken"]
         except KeyError:
             raise NintendoException("Invalid response from Nintendo")
 
@@ -4,5 +4,8 @@ from splatnet3_scraper.auth.tokens.environment_manager import (
 )
 from splatnet3_scraper.auth.tokens.keychain import TokenKeychain
 from splatnet3_scraper.auth.tokens.manager import TokenManager
-from splatnet3_scraper.auth.tokens.regenerator import TokenRegenerator
+from splatnet3_scraper.auth.tokens.regenerator import (
+    TokenBundle,
+    TokenRegenerator,
+)
 from splatnet3_scraper.auth.tokens.tokens import Token
@@ -5,8 +5,10 @@ from splatnet3_scraper.auth.nso import NSO
 from splatnet3_scraper.auth.tokens.environment_manager import (
     EnvironmentVariablesManager,
 )
+from splatnet3_scraper.auth.tokens.keychain import TokenKeychain
 from splatnet3_scraper.auth.tokens.manager import TokenManager
 from splatnet3_scraper.auth.tokens.regenerator import TokenRegenerator
+from splatnet3_scraper.auth.tokens.tokens import Token
 from splatnet3_scraper.constants import (
     DEFAULT_F_TOKEN_URL,
     DEFAULT_USER_AGENT,
@@ -101,9 +103,15 @@ class TokenManagerConstructor:
         manager.add_token(gtoken, TOKENS.GTOKEN)
 
         if bullet_token is None:
-            bullet_token = TokenRegenerator.generate_bullet_token(
-                manager.nso, manager.f_token_url, user_agent=user_agent
-            ).value
+            # Generate the bullet token from the gtoken in the keychain, so the
+            # two always belong together and no other gtoken is generated
+            new_bullet_token, _ = TokenRegenerator.generate_bullet_token(
+                manager.nso,
+                manager.f_token_url,
+                user_agent=user_agent,
+                gtoken=manager.get_token(TOKENS.GTOKEN),
+            )
+            bullet_token = new_bullet_token.value
         manager.add_token(bullet_token, TOKENS.BULLET_TOKEN)
         return manager
 
@@ -114,6 +122,7 @@ class TokenManagerConstructor:
         nso: NSO | None = None,
         f_token_url: str | list[str] = DEFAULT_F_TOKEN_URL,
         user_agent: str = DEFAULT_USER_AGENT,
+        keychain_path: str | None = None,
     ) -> TokenManager:
         """Loads tokens from environment variables.
 
@@ -127,10 +136,15 @@ class TokenManagerConstructor:
 
         The session token environment variable is required, and if it is not
         set, a ValueError will be raised. The other environment variables are
-        optional and will be generated if they are not set.
+        optional and will be generated if they are not set. When all three are
+        set, no network request is made; the tokens are only checked the first
+        time they are used, and regenerated then if SplatNet rejects them.
 
-        Tests the tokens before returning the token manager using the
-        ``test_tokens`` method.
+        If ``keychain_path`` is provided, tokens missing from the environment
+        are taken from the keychain saved there by a previous run, as long as
+        they belong to the same session token and have not expired. The
+        resulting keychain is saved back to the same path, so short-lived
+        processes do not need to regenerate the tokens on every start.
 
         Args:
             env_manager (EnvironmentVariablesManager): The environment variables
@@ -145,19 +159,77 @@ class TokenManagerConstructor:
                 None.
             user_agent (str): The user agent to use when generating the bullet
                 token. Defaults to DEFAULT_USER_AGENT.
+            keychain_path (str | None): The path of a keychain file used to
+                reuse tokens between processes. If None, no keychain file is
+                read or written. Defaults to None.
 
         Returns:
             TokenManager: The token manager with the tokens loaded.
         """
         env_manager = env_manager or EnvironmentVariablesManager()
         tokens = env_manager.get_all()
+        session_token = cast(str, tokens[TOKENS.SESSION_TOKEN])
+        gtoken = tokens.get(TOKENS.GTOKEN, None)
+        bullet_token = tokens.get(TOKENS.BULLET_TOKEN, None)
+
+        cached: dict[str, Token] = {}
+        if keychain_path is not None:
+            cached = TokenManagerConstructor._load_cached_tokens(
+                keychain_path, session_token
+            )
+            if gtoken is None and TOKENS.GTOKEN in cached:
+                gtoken = cached[TOKENS.GTOKEN].value
+            if bullet_token is None and TOKENS.BULLET_TOKEN in cached:
+                bullet_token = cached[TOKENS.BULLET_TOKEN].value
+
         manager = TokenManagerConstructor.from_tokens(
-            session_token=cast(str, tokens[TOKENS.SESSION_TOKEN]),
-            gtoken=tokens.get(TOKENS.GTOKEN, None),
-            bullet_token=tokens.get(TOKENS.BULLET_TOKEN, None),
+            session_token=session_token,
+            gtoken=gtoken,
+            bullet_token=bullet_token,
             nso=nso,
             f_token_url=f_token_url,
             user_agent=user_agent,
         )
         manager.flag_origin("env")
+
+        if keychain_path is not None:
+            # Keep the original timestamps of reused tokens so that they still
+            # expire on time
+            for token in cached.values():
+                if manager.get_token(token.name).value == token.value:
+                    manager.add_token(token)
+            try:
+                manager.keychain.save(keychain_path)
+            except OSError as e:
+                logger.debug("Failed to save keychain: %s", e)
         return manager
+
+    @staticmethod
+    def _load_cached_tokens(path: str, session_token: str) -> dict[str, Token]:
+        """Loads the unexpired tokens from a keychain file written by a
+        previous run. Tokens are only reused if the keychain was saved for the
+        same session token. A missing or unreadable keychain file is treated as
+        an empty keychain.
+
+        Args:
+            path (str): The path to the keychain file.
+            session_token (str): The current session token.
+
+        Returns:
+            dict[str, Token]: The unexpired tokens from the keychain file,
+                keyed by name.
+        """
+        try:
+            keychain = TokenKeychain.load(path)
+        except (OSError, ValueError) as e:
+            logger.debug("Not reusing keychain at %s: %s", path, e)
+            return {}
+
+        saved = keychain.keychain.get(TOKENS.SESSION_TOKEN)
+        if saved is None or saved.value != session_token:
+            return {}
+        return {
+            name: token
+            for name, token in keychain.keychain.items()
+            if name != TOKENS.SESSION_TOKEN and not token.is_expired
+        }
@@ -17,9 +17,13 @@ class EnvironmentVariablesManager:
 
     def __init__(self) -> None:
         """Initializes the class and sets up the base environment variables."""
-        self.variable_names = {}
+        self.variable_names: dict[str, str] = {}
+        # Reverse mapping of ``variable_names`` so ``variable_to_token`` does
+        # not need to scan every token. Kept in sync by ``add_token`` and
+        # ``remove_token``.
+        self._variable_tokens: dict[str, str] = {}
         for token in self.BASE_TOKENS:
-            self.variable_names[token] = ENV_VAR_NAMES[token]
+            self.add_token(token, ENV_VAR_NAMES[token])
 
     def token_to_variable(self, token: str) -> str:
         """Given the token name, returns the environment variable name.
@@ -44,10 +48,10 @@ class EnvironmentVariablesManager:
         Returns:
             str: The token name.
         """
-        for token, variable_name in self.variable_names.items():
-            if variable_name == variable:
-                return token
-        raise KeyError(f"Variable {variable} is not defined.")
+        try:
+            return self._variable_tokens[variable]
+        except KeyError:
+            raise KeyError(f"Variable {variable} is not defined.") from None
 
     def add_token(self, token_name: str, variable_name: str) -> None:
         """Adds a new token to the environment variables.
@@ -56,7 +60,18 @@ class EnvironmentVariablesManager:
             token_name (str): The token name.
             variable_name (str): The environment variable name.
         """
+        old_variable_name = self.variable_names.get(token_name)
         self.variable_names[token_name] = variable_name
+        if (
+            old_variable_name is not None
+            and old_variable_name != variable_name
+            and self._variable_tokens.get(old_variable_name) == token_name
+        ):
+            self._remap_variable(old_variable_name)
+        if variable_name not in self._variable_tokens:
+            self._variable_tokens[variable_name] = token_name
+        elif self._variable_tokens[variable_name] != token_name:
+            self._remap_variable(variable_name)
 
     def remove_token(self, token_name: str) -> None:
         """Removes a token from the environment variables.
@@ -69,7 +84,23 @@ class EnvironmentVariablesManager:
         """
         if token_name in self.BASE_TOKENS:
             raise ValueError(f"Cannot remove base token {token_name}.")
-        del self.variable_names[token_name]
+        variable_name = self.variable_names.pop(token_name)
+        if self._variable_tokens.get(variable_name) == token_name:
+            self._remap_variable(variable_name)
+
+    def _remap_variable(self, variable_name: str) -> None:
+        """Points the reverse mapping of an environment variable at the first
+        token that still uses it, or removes it if no token does. This is only
+        needed when several tokens share the same environment variable.
+
+        Args:
+            variable_name (str): The environment variable name.
+        """
+        for token_name, token_variable in self.variable_names.items():
+            if token_variable == variable_name:
+                self._variable_tokens[variable_name] = token_name
+                return
+        self._variable_tokens.pop(variable_name, None)
 
     def get(self, token: str) -> str | None:
         """Gets the environment variable for the given token.
@@ -88,4 +119,10 @@ class EnvironmentVariablesManager:
         Returns:
             dict[str, str]: The environment variables.
         """
-        return {token: self.get(token) for token in self.variable_names.keys()}
+        # Resolve the variable names directly instead of going through
+        # ``get``, which looks up each token's variable name again
+        environ_get = os.environ.get
+        return {
+            token: environ_get(variable_name)
+            for token, variable_name in self.variable_names.items()
+        }
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import json
 import logging
+import os
+import tempfile
 import time
-from typing import Literal, overload
+from typing import Iterable, Literal, overload
 
 from splatnet3_scraper.auth.tokens.tokens import Token
 
@@ -72,6 +75,61 @@ class TokenKeychain:
         token_keychain.keychain = {token.name: token for token in tokens}
         return token_keychain
 
+    @classmethod
+    def load(cls, path: str) -> TokenKeychain:
+        """Loads a keychain saved with ``save``. The timestamps of the tokens
+        are restored, so the expiration of each token carries over between
+        processes.
+
+        Args:
+            path (str): The path to the keychain file.
+
+        Raises:
+            ValueError: If the file is not a valid keychain file.
+
+        Returns:
+            TokenKeychain: The ``TokenKeychain`` object loaded from the file.
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        try:
+            tokens = [
+                Token(token["value"], token["name"], token["timestamp"])
+                for token in data
+            ]
+        except (KeyError, TypeError):
+            raise ValueError(f"{path} is not a valid keychain file.")
+        return cls.from_list(tokens)
+
+    def save(self, path: str) -> None:
+        """Saves the keychain to a file so that it can be reused by another
+        process with ``load``. The file is written to a temporary file next to
+        ``path`` first and then moved into place, so a concurrent reader never
+        sees a partially written keychain. The file is only readable by the
+        current user, as it contains the tokens in plain text.
+
+        Args:
+            path (str): The path to save the keychain to.
+        """
+        data = [
+            {
+                "name": token.name,
+                "value": token.value,
+                "timestamp": token.timestamp,
+            }
+            for token in self._keychain.values()
+        ]
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
     def to_dict(self) -> dict[str, str]:
         """Converts the keychain to a dictionary. This is useful for saving the
         keychain to a file.
@@ -82,40 +140,65 @@ class TokenKeychain:
         return {name: token.value for name, token in self.keychain.items()}
 
     @overload
-    def get(self, name: str, full_token: Literal[False] = ...) -> str:
+    def get(
+        self,
+        name: str,
+        full_token: Literal[False] = ...,
+        *,
+        allow_expired: bool = ...,
+    ) -> str:
         ...
 
     @overload
-    def get(self, name: str, full_token: Literal[True]) -> Token:
+    def get(
+        self,
+        name: str,
+        full_token: Literal[True],
+        *,
+        allow_expired: bool = ...,
+    ) -> Token:
         ...
 
     @overload
-    def get(self, name: str, full_token: bool) -> str | Token:
+    def get(
+        self, name: str, full_token: bool, *, allow_expired: bool = ...
+    ) -> str | Token:
         ...
 
-    def get(self, name: str, full_token: bool = False) -> str | Token:
+    def get(
+        self, name: str, full_token: bool = False, *, allow_expired: bool = True
+    ) -> str | Token:
         """Gets a token from the manager given a token type.
 
         If ``full_token`` is True, the full ``Token`` object will be returned.
         Otherwise, just the value of the token will be returned. If the token
-        type is not found, a ValueError will be raised.
+        type is not found, a ValueError will be raised. If ``allow_expired`` is
+        False, a ValueError will also be raised if the token is known to have
+        expired, so callers can regenerate it before a request fails instead of
+        after.
 
         Args:
             name (str): The type of the token to get, as defined in the
                 ``Token.name`` field.
             full_token (bool): Whether to return the full ``Token`` object or
                 just the value of the token. Defaults to False.
+            allow_expired (bool): Whether to return the token even if it has
+                expired. Defaults to True.
 
         Raises:
-            ValueError: If the given token type is not found in the manager.
+            ValueError: If the given token type is not found in the manager, or
+                if it has expired and ``allow_expired`` is False.
 
         Returns:
             str | Token: The token, either as a string or a ``Token`` object as
                 defined by the ``full_token`` argument.
         """
-        token_obj = self.keychain.get(name, None)
-        if token_obj is None:
-            raise ValueError(f"Token named {name} not found.")
+        try:
+            token_obj = self._keychain[name]
+        except KeyError:
+            raise ValueError(f"Token named {name} not found.") from None
+        if not allow_expired and token_obj.is_expired:
+            raise ValueError(f"Token named {name} has expired.")
         if full_token:
             return token_obj
         return token_obj.value
@@ -176,3 +259,19 @@ class TokenKeychain:
         logger.info("Adding token %s", token.name)
         self.keychain[token.name] = token
         return token
+
+    def add_tokens(self, tokens: Iterable[Token]) -> list[Token]:
+        """Adds several ``Token`` objects to the keychain at once. Tokens that
+        already exist will be overwritten. If the same name appears more than
+        once, the last token with that name is kept.
+
+        Args:
+            tokens (Iterable[Token]): The tokens to add to the keychain.
+
+        Returns:
+            list[Token]: The tokens that were added to the keychain.
+        """
+        added = list(tokens)
+        logger.info("Adding tokens %s", ", ".join(t.name for t in added))
+        self._keychain.update((token.name, token) for token in added)
+        return added
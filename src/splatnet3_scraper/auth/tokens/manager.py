@@ -1,4 +1,6 @@
 import logging
+import threading
+from typing import Iterable
 
 from splatnet3_scraper.auth.nso import NSO
 from splatnet3_scraper.auth.tokens.environment_manager import (
@@ -16,8 +18,16 @@ from splatnet3_scraper.constants import (
 
 logger = logging.getLogger(__name__)
 
+# Tokens that the NSO object also keeps a copy of, mapped to its attribute
+_NSO_TOKEN_ATTRIBUTES = {
+    TOKENS.GTOKEN: "_gtoken",
+    TOKENS.SESSION_TOKEN: "_session_token",
+}
+
 
 class ManagerOrigin:
+    __slots__ = ("origin", "data")
+
     def __init__(self, origin: ORIGIN, data: str | None = None) -> None:
         self.origin = origin
         self.data = data
@@ -66,13 +76,14 @@ class TokenManager:
         """
         nso = nso or NSO.new_instance()
         self.keychain = TokenKeychain()
+        # Guards token regeneration so that concurrent callers that all saw
+        # the same stale tokens only trigger a single regeneration
+        self._regenerate_lock = threading.Lock()
+        self._regenerations = 0
         # Check that nso has a session token
-        try:
-            session_token = nso.session_token
-            self.nso = nso
-            self.add_token(session_token, TOKENS.SESSION_TOKEN)
-        except ValueError as e:
-            raise e
+        session_token = nso.session_token
+        self.nso = nso
+        self.add_token(session_token, TOKENS.SESSION_TOKEN)
 
         if isinstance(f_token_url, str):
             self.f_token_url = [f_token_url]
@@ -89,7 +100,7 @@ class TokenManager:
         but can potentially be used for other things in the future. This is
         called automatically when the token manager is loaded from a config
         file or environment variables. Subsequent calls to this method will
-        overwrite the previous origin.
+        overwrite the previous origin, unless they flag the same origin again.
 
         Args:
             origin (ORIGIN): The origin of the token manager. One of "memory",
@@ -100,6 +111,8 @@ class TokenManager:
                 manager was loaded from environment variables, this would be
                 None.
         """
+        if self.origin.origin == origin and self.origin.data == data:
+            return
         logger.debug("Flagging origin %s with data %s", origin, data)
         self.origin = ManagerOrigin(origin, data)
 
@@ -125,10 +138,7 @@ class TokenManager:
             ValueError: If the token is a string and the name of the token is
                 not provided.
         """
-        try:
-            new_token = self.keychain.add_token(token, name, timestamp)
-        except ValueError as e:
-            raise e
+        new_token = self.keychain.add_token(token, name, timestamp)
 
         logger.debug("Added token %s to keychain", new_token.name)
         if new_token.name == TOKENS.GTOKEN:
@@ -136,37 +146,58 @@ class TokenManager:
         elif new_token.name == TOKENS.SESSION_TOKEN:
             self.nso._session_token = new_token.value
 
-    def get_token(self, name: str) -> Token:
+    def add_tokens(self, tokens: Iterable[Token]) -> None:
+        """Adds several ``Token`` objects to the keychain at once. Existing
+        tokens with the same names will be overwritten.
+
+        Args:
+            tokens (Iterable[Token]): The tokens to add to the keychain.
+        """
+        for token in self.keychain.add_tokens(tokens):
+            attribute = _NSO_TOKEN_ATTRIBUTES.get(token.name)
+            if attribute is not None:
+                setattr(self.nso, attribute, token.value)
+
+    def get_token(self, name: str, allow_expired: bool = True) -> Token:
         """Gets a token from the keychain.
 
         Args:
             name (str): The name of the token to get.
+            allow_expired (bool): Whether to return the token even if it has
+                expired. Defaults to True.
 
         Raises:
-            ValueError: If the token is not found in the keychain.
+            ValueError: If the token is not found in the keychain, or if it has
+                expired and ``allow_expired`` is False.
 
         Returns:
             Token: The token that was retrieved.
         """
-        try:
-            token = self.keychain.get(name, full_token=True)
-        except ValueError as e:
-            raise e
-
-        logger.debug("Retrieved token %s from keychain", token.name)
-        return token
+        return self.keychain.get(
+            name, full_token=True, allow_expired=allow_expired
+        )
 
     def regenerate_tokens(self) -> None:
         """Regenerates all the tokens. This is done by calling the
         ``TokenRegenerator.generate_all_tokens`` method. The tokens are then
         added to the keychain.
+
+        Only one regeneration runs at a time. If another thread regenerates the
+        tokens while this call is waiting for its turn, the fresh tokens are
+        reused instead of being regenerated again.
         """
-        logger.info("Regenerating tokens")
-        tokens = TokenRegenerator.generate_all_tokens(
-            self.nso, self.f_token_url
-        )
-        for token in tokens.values():
-            self.add_token(token)
+        regenerations = self._regenerations
+        with self._regenerate_lock:
+            if self._regenerations != regenerations:
+                logger.info("Tokens were already regenerated, skipping")
+                return
+
+            logger.info("Regenerating tokens")
+            tokens = TokenRegenerator.generate_all_tokens(
+                self.nso, self.f_token_url
+            )
+            self.add_tokens(tokens)
+            self._regenerations += 1
 
     def generate_gtoken(self) -> None:
         """Generates a gtoken. This is done by calling the
@@ -179,11 +210,21 @@ class TokenManager:
 
     def generate_bullet_token(self) -> None:
         """Generates a bullet token. This is done by calling the
-        ``TokenRegenerator.generate_bullet_token`` method. The token is then
-        added to the keychain.
+        ``TokenRegenerator.generate_bullet_token`` method with the unexpired
+        gtoken in the keychain, if there is one. The token is then added to
+        the keychain. If a new gtoken had to be generated to obtain the bullet
+        token, it is added to the keychain as well.
         """
         logger.info("Generating bullet token")
-        token = TokenRegenerator.generate_bullet_token(
-            self.nso, self.f_token_url, DEFAULT_USER_AGENT
+        try:
+            gtoken: Token | None = self.get_token(
+                TOKENS.GTOKEN, allow_expired=False
+            )
+        except ValueError:
+            gtoken = None
+        token, new_gtoken = TokenRegenerator.generate_bullet_token(
+            self.nso, self.f_token_url, DEFAULT_USER_AGENT, gtoken=gtoken
         )
+        if new_gtoken is not None:
+            self.add_token(new_gtoken)
         self.add_token(token)
@@ -1,10 +1,13 @@
 import logging
 import time
-from typing import cast
+from functools import lru_cache
+from typing import NamedTuple, cast
 
-import requests
-
-from splatnet3_scraper.auth.exceptions import FTokenException, SplatNetException
+from splatnet3_scraper.auth.exceptions import (
+    FTokenException,
+    NintendoException,
+    SplatNetException,
+)
 from splatnet3_scraper.auth.graph_ql_queries import queries
 from splatnet3_scraper.auth.nso import NSO
 from splatnet3_scraper.auth.tokens.tokens import Token
@@ -17,6 +20,31 @@ from splatnet3_scraper.utils import retry
 
 logger = logging.getLogger(__name__)
 
+# (connect, read) timeout, in seconds, for the token validation request
+VALIDATION_TIMEOUT = (3.05, 10)
+
+
+@lru_cache(maxsize=4)
+def _home_query_body(query_hash: str) -> str:
+    """Builds the body of the ``HomeQuery`` request used to validate tokens.
+    The body is cached per query hash, so it is only serialized again when the
+    hash changes.
+
+    Args:
+        query_hash (str): The hash of the ``HomeQuery`` query.
+
+    Returns:
+        str: The body of the request, as a string.
+    """
+    return queries.query_body_hash(query_hash)
+
+
+class TokenBundle(NamedTuple):
+    """The gtoken and bullet token produced by a full regeneration."""
+
+    gtoken: Token
+    bullet_token: Token
+
 
 class TokenRegenerator:
     """Regenerates tokens. Only has static methods, so there is no need to
@@ -52,17 +80,53 @@ class TokenRegenerator:
         raise FTokenException("Could not get gtoken from any ftoken url")
 
     @staticmethod
-    @retry(times=1, exceptions=SplatNetException)
+    def _fetch_user_info(nso: NSO) -> dict[str, str]:
+        """Fetches the user information needed to generate a bullet token and
+        stores it in the ``NSO`` object. Unlike generating a gtoken, this does
+        not require any ftoken requests.
+
+        Args:
+            nso (NSO): The NSO object to fetch the user information with. It
+                must have the session token set.
+
+        Raises:
+            NintendoException: If the user access token cannot be obtained
+                from the session token.
+
+        Returns:
+            dict[str, str]: The user information.
+        """
+        response = nso.get_user_access_token(nso.session_token)
+        try:
+            user_access_token = response["access_token"]
+        except (KeyError, TypeError):
+            raise NintendoException(
+                f"Failed to get user access token. Response: {response}"
+            )
+        user_info = nso.get_user_info(user_access_token)
+        nso._user_info = user_info
+        return user_info
+
+    @staticmethod
+    @retry(times=1, exceptions=SplatNetException, delays=(0.4,))
     def generate_bullet_token(
-        nso: NSO, f_token_urls: list[str], user_agent: str = DEFAULT_USER_AGENT
-    ) -> Token:
+        nso: NSO,
+        f_token_urls: list[str],
+        user_agent: str = DEFAULT_USER_AGENT,
+        gtoken: Token | None = None,
+    ) -> tuple[Token, Token | None]:
         """Generates a bullet token.
 
-        This method will try to generate a bullet token. If a gtoken has not
-        been generated, it will generate one from the list of ftoken urls. If
-        the gtoken has been generated, it will attempt to use that to generate
-        the bullet token. This method is wrapped in a retry decorator, so it
-        will retry once if it fails the first time.
+        This method will try to generate a bullet token. If a gtoken is given,
+        it is used to generate the bullet token, and only the user information
+        is fetched if the ``NSO`` object does not have it yet. Otherwise, if
+        the ``NSO`` object has not generated a gtoken yet, one is generated
+        from the list of ftoken urls and returned alongside the bullet token so
+        that the caller can keep it. If the gtoken has been generated, it will
+        attempt to use that to generate the bullet token. This method is
+        wrapped in a retry decorator, so it will retry once if it fails the
+        first time, after a short jittered delay so that a rate limited server
+        is not hit again immediately.
 
         Args:
             nso (NSO): The NSO object to use to generate the bullet token and
@@ -71,26 +135,39 @@ class TokenRegenerator:
                 the gtoken from if it has not already been generated.
             user_agent (str): The user agent to use when generating the bullet
                 token. Defaults to DEFAULT_USER_AGENT.
+            gtoken (Token | None): The gtoken to generate the bullet token
+                with. If None, the gtoken of the ``NSO`` object is used, and
+                one is generated if it does not have one. Defaults to None.
 
         Returns:
             Token: The bullet token that was generated.
+            Token | None: The gtoken that was generated to obtain the bullet
+                token, or None if no gtoken had to be generated.
         """
-        if nso._user_info is None:
-            gtoken = TokenRegenerator.generate_gtoken(nso, f_token_urls).value
+        new_gtoken: Token | None = None
+        if gtoken is not None:
+            gtoken_value = gtoken.value
+            user_info = nso._user_info or TokenRegenerator._fetch_user_info(nso)
+        elif nso._user_info is None:
+            new_gtoken = TokenRegenerator.generate_gtoken(nso, f_token_urls)
+            gtoken_value = new_gtoken.value
             user_info = cast(dict[str, str], nso._user_info)
         else:
-            gtoken = cast(str, nso._gtoken)
+            gtoken_value = cast(str, nso._gtoken)
             user_info = nso._user_info
 
-        bullet_token = nso.get_bullet_token(gtoken, user_info, user_agent)
-        return Token(bullet_token, TOKENS.BULLET_TOKEN, time.time())
+        bullet_token = nso.get_bullet_token(gtoken_value, user_info, user_agent)
+        return (
+            Token(bullet_token, TOKENS.BULLET_TOKEN, time.time()),
+            new_gtoken,
+        )
 
     @staticmethod
     def generate_all_tokens(
         nso: NSO,
         f_token_urls: list[str],
         user_agent: str = DEFAULT_USER_AGENT,
-    ) -> dict[str, Token]:
+    ) -> TokenBundle:
         """
         Generates all tokens required for authentication.
 
@@ -101,14 +178,14 @@ class TokenRegenerator:
                 Defaults to DEFAULT_USER_AGENT.
 
         Returns:
-            dict[str, Token]: A dictionary containing all the generated tokens.
+            TokenBundle: The generated gtoken and bullet token.
         """
         logger.info("Generating all tokens")
         gtoken = TokenRegenerator.generate_gtoken(nso, f_token_urls)
-        bullet_token = TokenRegenerator.generate_bullet_token(
-            nso, f_token_urls, user_agent
+        bullet_token, _ = TokenRegenerator.generate_bullet_token(
+            nso, f_token_urls, user_agent, gtoken=gtoken
         )
-        return {TOKENS.GTOKEN: gtoken, TOKENS.BULLET_TOKEN: bullet_token}
+        return TokenBundle(gtoken, bullet_token)
 
     @staticmethod
     def validate_tokens(
@@ -117,12 +194,15 @@ class TokenRegenerator:
         nso: NSO,
         f_token_urls: list[str],
         user_agent: str = DEFAULT_USER_AGENT,
-    ) -> dict[str, Token]:
+    ) -> TokenBundle:
         """Validates the tokens.
 
         This method will check if the tokens are valid. If they are not valid,
-        it will attempt to regenerate them. The tokens are returned in a
-        dictionary with the token name as the key and the token as the value.
+        it will attempt to regenerate them. Freshly regenerated tokens are
+        returned as is. Only when both tokens were already valid is a
+        ``HomeQuery`` request made to check that SplatNet still accepts them,
+        regenerating all tokens if it does not. The tokens are returned as a
+        ``TokenBundle``.
 
         Args:
             gtoken (Token): Gtoken to validate.
@@ -133,26 +213,34 @@ class TokenRegenerator:
             user_agent (str): The user agent string to use for the request.
 
         Returns:
-            dict[str, Token]: A dictionary containing all the tokens.
+            TokenBundle: The validated gtoken and bullet token.
         """
         logger.info("Testing tokens")
+        regenerated = False
         if not gtoken.is_valid:
             gtoken = TokenRegenerator.generate_gtoken(nso, f_token_urls)
+            regenerated = True
         if not bullet_token.is_valid:
-            bullet_token = TokenRegenerator.generate_bullet_token(
-                nso, f_token_urls, user_agent
+            bullet_token, _ = TokenRegenerator.generate_bullet_token(
+                nso, f_token_urls, user_agent, gtoken=gtoken
             )
+            regenerated = True
+        if regenerated:
+            # Tokens that were just issued do not need another round trip
+            return TokenBundle(gtoken, bullet_token)
 
         header = queries.query_header(bullet_token.value, "en-US", user_agent)
 
-        response = requests.post(
+        # Go through the NSO session so the check reuses its pooled connections
+        response = nso.session.post(
             GRAPH_QL_REFERENCE_URL,
-            data=queries.query_body("HomeQuery"),
+            data=_home_query_body(queries.get_query("HomeQuery")),
             headers=header,
             cookies={"_gtoken": gtoken.value},
+            timeout=VALIDATION_TIMEOUT,
         )
         if response.status_code != 200:
             return TokenRegenerator.generate_all_tokens(
                 nso, f_token_urls, user_agent
             )
-        return {TOKENS.GTOKEN: gtoken, TOKENS.BULLET_TOKEN: bullet_token}
+        return TokenBundle(gtoken, bullet_token)
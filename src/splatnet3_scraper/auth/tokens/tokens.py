@@ -11,6 +11,8 @@ class Token:
     the token.
     """
 
+    __slots__ = ("value", "name", "timestamp", "expiration")
+
     def __init__(self, value: str, name: str, timestamp: float) -> None:
         """Initializes a ``Token`` object. The expiration time is calculated
         based on the token type, with a default of ``1e10`` seconds (about 316
@@ -58,7 +60,7 @@ class Token:
         Returns:
             bool: True if the token is expired, False otherwise.
         """
-        return self.time_left <= 0
+        return time.time() >= self.expiration
 
     @property
     def time_left(self) -> float:
@@ -77,7 +79,8 @@ class Token:
         """A string representation of the time left before the token expires.
         If the token is expired, "Expired" will be returned. This is not a
         guarantee that the token is expired, but it is a good indicator that
-        it is for most cases. If the time left is greater than 100,000 hours,
+        it is for most cases. The time left is shown in whole hours, minutes
+        and seconds. If the time left is greater than 100,000 hours,
         "basically forever" will be returned. If you have a python session
         running for that long, you have bigger problems than a token expiring.
 
@@ -88,30 +91,25 @@ class Token:
         time_left = self.time_left
         if time_left <= 0:
             return "Expired"
-        mins, secs = divmod(time_left, 60)
-        hours, mins = divmod(mins, 60)
-
-        out = ""
-        if hours > 1e5:
+        seconds = int(time_left)
+        if seconds > 360_000_000:
             return "basically forever"
-        if hours > 0:
-            out += f"{hours:.0f}h "
-        if mins > 0:
-            out += f"{mins:.0f}m "
-        if secs > 0:
-            out += f"{secs:.1f}s"
-        return out.strip()
+        hours, seconds = divmod(seconds, 3600)
+        mins, secs = divmod(seconds, 60)
+
+        parts = []
+        if hours:
+            parts.append(f"{hours}h")
+        if mins:
+            parts.append(f"{mins}m")
+        if secs or not parts:
+            parts.append(f"{secs}s")
+        return " ".join(parts)
 
     def __repr__(self) -> str:
-        out = "Token("
-        spaces = " " * len(out)
-        out += (
-            f"value={self.value[:5]}...,\n"
-            + spaces
-            + f"name={self.name},\n"
-            + spaces
-            + "expires in "
-            + self.time_left_str
-            + "\n)"
+        # The continuation lines line up with the opening "Token("
+        return (
+            f"Token(value={self.value[:5]}...,\n"
+            f"      name={self.name},\n"
+            f"      expires in {self.time_left_str}\n)"
         )
-        return out
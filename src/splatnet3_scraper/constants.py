@@ -17,6 +17,9 @@ DEFAULT_USER_AGENT = (
     + "Mobile Safari/537.36"
 )
 APP_VERSION_FALLBACK = "2.10.1"
+# Buffer size used when writing responses to disk, large enough to coalesce
+# detailed dumps into a handful of write syscalls.
+WRITE_BUFFER_SIZE = 1 << 20
 
 
 class TOKENS:
@@ -29,6 +32,8 @@ TOKEN_EXPIRATIONS = {
     TOKENS.GTOKEN: (60 * 60 * 6) + (60 * 30),
     TOKENS.BULLET_TOKEN: (60 * 60 * 2),
 }
+CACHE_DIR_ENV_VAR = "SN3S_CACHE_DIR"
+NSO_VERSION_ENV_VAR = "SN3S_NSO_VERSION"
 ENV_VAR_NAMES = {
     TOKENS.SESSION_TOKEN: "SN3S_SESSION_TOKEN",
     TOKENS.GTOKEN: "SN3S_GTOKEN",
@@ -68,3 +73,8 @@ ABILITIES = [
 ]
 
 ALL_ABILITIES = PRIMARY_ONLY + ABILITIES
+
+# Set versions of the lists above for constant time membership checks
+PRIMARY_ONLY_SET = frozenset(PRIMARY_ONLY)
+ABILITIES_SET = frozenset(ABILITIES)
+ALL_ABILITIES_SET = frozenset(ALL_ABILITIES)
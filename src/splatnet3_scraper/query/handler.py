@@ -13,6 +13,11 @@ from splatnet3_scraper.query.config import Config
 from splatnet3_scraper.query.responses import QueryResponse
 from splatnet3_scraper.utils import retry
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
+
 logger = logging.getLogger(__name__)
 
 
@@ -287,6 +292,37 @@ class QueryHandler:
             variables=variables,
         )
 
+    @staticmethod
+    def __parse_response(response: requests.Response) -> QueryResponse:
+        """Decodes the body of a query response once and wraps its data in a
+        ``QueryResponse`` object. The body is decoded with ``orjson`` when it
+        is installed, as it parses the raw bytes directly and is much faster
+        on large responses, otherwise ``response.json()`` is used.
+
+        Args:
+            response (requests.Response): The response from SplatNet 3.
+
+        Raises:
+            SplatNetException: If the response JSON contains an ``errors``
+                key.
+
+        Returns:
+            QueryResponse: The data from the response.
+        """
+        if orjson is not None:
+            response_json = orjson.loads(response.content)
+        else:
+            response_json = response.json()
+
+        if "errors" in response_json:
+            errors = response_json["errors"]
+            error_message = (
+                "Query was successful but returned at least one error."
+            )
+            error_message += " Errors: " + json.dumps(errors, indent=4)
+            raise SplatNetException(error_message)
+        return QueryResponse(data=response_json["data"])
+
     @retry(times=1, exceptions=ConnectionError)
     def query_hash(
         self,
@@ -341,14 +377,7 @@ class QueryHandler:
             self.config.regenerate_tokens()
             response = self.raw_query_hash(query_hash, language, variables)
 
-        if "errors" in response.json():
-            errors = response.json()["errors"]
-            error_message = (
-                "Query was successful but returned at least one error."
-            )
-            error_message += " Errors: " + json.dumps(errors, indent=4)
-            raise SplatNetException(error_message)
-        return QueryResponse(data=response.json()["data"])
+        return self.__parse_response(response)
 
     @retry(times=1, exceptions=ConnectionError)
     def query(
@@ -402,13 +431,4 @@ class QueryHandler:
             self.config.regenerate_tokens()
             response = self.raw_query(query_name, language, variables)
 
-        if "errors" in response.json():
-            errors = response.json()["errors"]
-            error_message = (
-                "Query was successful but returned at least one error."
-            )
-
-            error_message += " Errors: " + json.dumps(errors, indent=4)
-            raise SplatNetException(error_message)
-
-        return QueryResponse(data=response.json()["data"])
+        return self.__parse_response(response)
@@ -3,10 +3,34 @@ import csv
 import gzip
 import hashlib
 import json
-from typing import Any, Callable, Literal, overload
+from functools import lru_cache
+from typing import Any, Callable, Iterator, Literal, overload
 
+from splatnet3_scraper.constants import WRITE_BUFFER_SIZE
 from splatnet3_scraper.utils import delinearize_json, linearize_json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
+
+
+@lru_cache()
+def _stable_header_hash(header: tuple[str, ...]) -> str:
+    """Returns a stable hash of a header tuple. Headers repeat heavily across
+    rows, so the digest is cached on the tuple itself, which is already
+    hashable, instead of being recomputed for every row.
+
+    Args:
+        header (tuple[str, ...]): The header to hash.
+
+    Returns:
+        str: The hex digest of the header.
+    """
+    # Use a stable hash function to ensure the same hash is generated
+    # across different Python versions
+    return hashlib.sha256(str(header).encode()).hexdigest()
+
 
 class LinearJSON:
     """Class containing methods for linearized JSON objects."""
@@ -47,10 +71,8 @@ class LinearJSON:
         Returns:
             str: The hash of the header.
         """
-        header_tuple = tuple(obj)
-        # Use a stable hash function to ensure the same hash is generated
-        # across different Python versions
-        return hashlib.sha256(str(header_tuple).encode()).hexdigest()
+        header_tuple = obj if isinstance(obj, tuple) else tuple(obj)
+        return _stable_header_hash(header_tuple)
 
     def hashed_header(self) -> str:
         """Returns the hash of the header.
@@ -178,6 +200,43 @@ class LinearJSON:
         """
         return [list(x) for x in zip(*self.data)]
 
+    @staticmethod
+    def __stringify_row(row: list[Any]) -> str:
+        """Stringifies a single row of data as a CSV line.
+
+        Args:
+            row (list[Any]): The row to stringify.
+
+        Returns:
+            str: The row as a comma-separated string.
+        """
+        # If a column has a comma, then we need to wrap the column in quotes
+        return ",".join(
+            [
+                f'"{col}"' if isinstance(col, str) and "," in col else str(col)
+                for col in row
+            ]
+        )
+
+    def stringify_chunks(self, chunk_size: int = 10_000) -> Iterator[str]:
+        """Stringifies the data of the LinearJSON object in chunks of rows.
+        Each chunk is a single string with rows separated by newlines, without
+        a trailing newline. This bounds the memory used when writing large
+        amounts of data, while still joining many rows per write.
+
+        Args:
+            chunk_size (int): The maximum number of rows per chunk. Defaults to
+                10,000.
+
+        Yields:
+            str: The stringified rows of each chunk.
+        """
+        stringify_row = self.__stringify_row
+        data = self.data
+        for start in range(0, len(data), chunk_size):
+            chunk = data[start : start + chunk_size]
+            yield "\n".join([stringify_row(row) for row in chunk])
+
     @overload
     def stringify(self, include_header: Literal[True] = ...) -> tuple[str, str]:
         ...
@@ -206,19 +265,7 @@ class LinearJSON:
             str | tuple[str, str]: The header and data as a string, or just the
                 data as a string.
         """
-        data = self.data
-        data_str = []
-        for row in data:
-            out_row = []
-            # If the row has a comma, then we need to wrap the row in quotes
-            for col in row:
-                if isinstance(col, str) and "," in col:
-                    out_col = f'"{col}"'
-                else:
-                    out_col = str(col)
-                out_row.append(out_col)
-            data_str.append(",".join(out_row))
-        data_str_out = "\n".join(data_str)
+        data_str_out = "\n".join(map(self.__stringify_row, self.data))
         if include_header:
             header_str = ",".join(self.header)
             return header_str, data_str_out
@@ -267,15 +314,45 @@ class JSONParser:
     def __to_linear_json(self) -> LinearJSON:
         """Converts the JSON object to a LinearJSON object.
 
+        Every row is linearized exactly once and the distinct headers are
+        collected along the way. If all rows share the same header, the rows
+        are used as is. Otherwise, the headers are merged once and each row is
+        scattered into the merged header using a column mapping computed once
+        per distinct header, rather than re-standardizing all of the rows seen
+        so far every time a new header shows up. Rows are replaced in place as
+        they are scattered, so only one copy of the data is held at a time, and
+        rows that already match the merged header are kept as is. Row order is
+        preserved.
+
         Returns:
             LinearJSON: The LinearJSON object.
         """
-        header, data = linearize_json(self.data[0])
-        out = LinearJSON(header, data)
-        for row in self.data[1:]:
-            header, data = linearize_json(row)
-            out.append(LinearJSON(header, data))
-        return out
+        row_headers: list[tuple[str, ...]] = []
+        rows: list[list[Any]] = []
+        for header, data in map(linearize_json, self.data):
+            row_headers.append(header)
+            rows.append(data)
+        headers = dict.fromkeys(row_headers)
+        if len(headers) == 1:
+            return LinearJSON(row_headers[0], rows)
+
+        new_header = sorted(set().union(*headers), key=lambda x: (len(x), x))
+        merged_header = tuple(new_header)
+        column_index = {column: i for i, column in enumerate(new_header)}
+        positions = {
+            header: [column_index[column] for column in header]
+            for header in headers
+            if header != merged_header
+        }
+        width = len(new_header)
+        for i, header in enumerate(row_headers):
+            if header == merged_header:
+                continue
+            row: list[Any] = [None] * width
+            for position, value in zip(positions[header], rows[i]):
+                row[position] = value
+            rows[i] = row
+        return LinearJSON(new_header, rows)
 
     def remove_columns(self, columns: list[str]) -> None:
         """Removes columns from the data.
@@ -321,10 +398,15 @@ class JSONParser:
             path (str): The path to save the CSV file to.
         """
         linear_json = self.__to_linear_json()
-        with open(path, "w", encoding="utf-8") as f:
-            header, data = linear_json.stringify()
-            f.write(header + "\n")
-            f.write(data)
+        with open(
+            path, "w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE
+        ) as f:
+            f.write(",".join(linear_json.header))
+            # Rows are joined and written in bounded chunks rather than
+            # building the whole file as a single string
+            for chunk in linear_json.stringify_chunks():
+                f.write("\n")
+                f.write(chunk)
 
     def __to_json(self, path: str, use_gzip: bool, **kwargs) -> None:
         """Saves the JSON object to a JSON file. Any keyword arguments are
@@ -340,10 +422,14 @@ class JSONParser:
         default_kwargs.update(kwargs)
         if use_gzip:
             open_function: Callable = gzip.open
-            open_kwargs = {"mode": "wt", "encoding": "utf-8"}
+            open_kwargs: dict[str, Any] = {"mode": "wt", "encoding": "utf-8"}
         else:
             open_function = open
-            open_kwargs = {"mode": "w", "encoding": "utf-8"}
+            open_kwargs = {
+                "mode": "w",
+                "encoding": "utf-8",
+                "buffering": WRITE_BUFFER_SIZE,
+            }
 
         with open_function(path, **open_kwargs) as f:
             json.dump(self.data, f, **default_kwargs)
@@ -368,6 +454,26 @@ class JSONParser:
         """
         self.__to_json(path, True, **kwargs)
 
+    def to_ndjson(self, path: str) -> None:
+        """Saves the JSON object to a newline-delimited JSON file, with one
+        compact JSON object per line. Rows are serialized and written one at a
+        time through a large write buffer, so the whole file is never held in
+        memory at once. Uses the ``orjson`` library if it is installed.
+
+        Args:
+            path (str): The path to save the newline-delimited JSON file to.
+        """
+        with open(path, "wb", buffering=WRITE_BUFFER_SIZE) as f:
+            if orjson is not None:
+                for row in self.data:
+                    f.write(orjson.dumps(row))
+                    f.write(b"\n")
+                return
+
+            for row in self.data:
+                f.write(json.dumps(row, ensure_ascii=False).encode("utf-8"))
+                f.write(b"\n")
+
     @staticmethod
     def automatic_type_conversion(row: list[str]) -> list[Any]:
         """Converts a row of strings to the most appropriate type.
@@ -423,6 +529,22 @@ class JSONParser:
         with open(path, "r", encoding="utf-8") as f:
             return cls(json.load(f))
 
+    @classmethod
+    def from_ndjson(cls, path: str) -> "JSONParser":
+        """Loads a JSON object from a newline-delimited JSON file.
+
+        Args:
+            path (str): The path to load the newline-delimited JSON file from.
+
+        Returns:
+            JSONParser: The JSONParser object.
+        """
+        loads: Callable[[bytes], Any] = (
+            orjson.loads if orjson is not None else json.loads
+        )
+        with open(path, "rb") as f:
+            return cls([loads(line) for line in f if line.strip()])
+
     @classmethod
     def from_gzipped_json(cls, path: str) -> "JSONParser":
         """Loads a JSON object from a gzipped JSON file.
@@ -13,9 +13,15 @@ from typing import (
     overload,
 )
 
+from splatnet3_scraper.constants import WRITE_BUFFER_SIZE
 from splatnet3_scraper.query.json_parser import JSONParser
 from splatnet3_scraper.utils import match_partial_path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
+
 T = TypeVar("T")
 S = TypeVar("S")
 
@@ -59,6 +65,8 @@ class QueryResponse:
         self._data = data
 
         self._metadata = self.__parse_metadata(metadata)
+        self._parser: JSONParser | None = None
+        self._parser_rows: list[dict[str, Any]] | None = None
 
     def __parse_metadata(
         self, metadata: dict[str, Any] | MetaData | None
@@ -163,31 +171,83 @@ class QueryResponse:
         """
         return datetime.fromtimestamp(self.timestamp_raw)
 
-    def to_json(self, path: str) -> None:
+    def __orjson_dumps(self, indent: int | None) -> bytes | None:
+        """Serializes the data with ``orjson`` if it is installed and supports
+        the requested indentation, which is either none or two spaces.
+
+        Args:
+            indent (int | None): The requested indentation level.
+
+        Returns:
+            bytes | None: The UTF-8 encoded JSON, or None if ``orjson`` cannot
+                be used and the caller should fall back to ``json.dump``.
+        """
+        if orjson is None:
+            return None
+        if indent is None:
+            return orjson.dumps(self.data)
+        if indent == 2:
+            return orjson.dumps(self.data, option=orjson.OPT_INDENT_2)
+        return None
+
+    def to_json(self, path: str, indent: int | None = 4) -> None:
         """Saves the data to a JSON file.
 
+        If the ``orjson`` library is installed and ``indent`` is None or 2, the
+        data is serialized with ``orjson`` and written in a single call.
+
         Args:
             path (str): The path to save the JSON file to.
+            indent (int | None): The indentation level passed to ``json.dump``.
+                Use None for the most compact output. Defaults to 4.
         """
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(self.data, f, ensure_ascii=False, indent=4)
-
-    def to_gzipped_json(self, path: str) -> None:
+        serialized = self.__orjson_dumps(indent)
+        if serialized is not None:
+            with open(path, "wb") as fb:
+                fb.write(serialized)
+            return
+
+        with open(
+            path, "w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE
+        ) as f:
+            json.dump(self.data, f, ensure_ascii=False, indent=indent)
+
+    def to_gzipped_json(self, path: str, indent: int | None = 4) -> None:
         """Saves the data to a gzipped JSON file.
 
+        If the ``orjson`` library is installed and ``indent`` is None or 2, the
+        data is serialized with ``orjson`` and written in a single call.
+
         Args:
             path (str): The path to save the gzipped JSON file to.
+            indent (int | None): The indentation level passed to ``json.dump``.
+                Use None for the most compact output. Defaults to 4.
         """
+        serialized = self.__orjson_dumps(indent)
+        if serialized is not None:
+            with gzip.open(path, "wb") as fb:
+                fb.write(serialized)
+            return
+
         with gzip.open(path, "wt", encoding="utf-8") as f:
-            json.dump(self.data, f, ensure_ascii=False, indent=4)
+            json.dump(self.data, f, ensure_ascii=False, indent=indent)
 
     def parse_json(self) -> JSONParser:
         """The JSONParser object containing the data.
 
+        The parser is created on first use and reused on subsequent calls. If
+        the parser's rows were replaced since then, for example by calling
+        ``JSONParser.remove_columns``, a fresh parser is created instead.
+
         Returns:
             JSONParser: The data.
         """
-        return JSONParser(self._data)
+        parser = self._parser
+        if parser is None or parser.data is not self._parser_rows:
+            parser = JSONParser(self._data)
+            self._parser = parser
+            self._parser_rows = parser.data
+        return parser
 
     def __repr__(self) -> str:
         """Returns a string representation of the QueryResponse.
@@ -262,11 +322,15 @@ class QueryResponse:
             QueryResponse: The QueryResponse object containing the data.
         """
         if isinstance(key, tuple):
+            if not key:
+                return self
+            # Walk the raw data and only wrap the final value, rather than
+            # creating an intermediate QueryResponse for every key
+            data: Any = self._data
             for k in key:
-                self = self[k]
-            return self
-
-        data = self._data[key]  # type: ignore
+                data = data[k]
+        else:
+            data = self._data[key]  # type: ignore
         if isinstance(data, (dict, list)):
             return QueryResponse(data, metadata=self._metadata)
         return data
@@ -1,3 +1,8 @@
+from splatnet3_scraper.utils.disk_cache import (
+    get_cache_dir,
+    read_cache,
+    write_cache,
+)
 from splatnet3_scraper.utils.hash_data import (
     fallback_path,
     get_fallback_hash_data,
@@ -0,0 +1,87 @@
+import json
+import logging
+import os
+import pathlib
+import tempfile
+import time
+from typing import Any
+
+from splatnet3_scraper.constants import CACHE_DIR_ENV_VAR
+
+logger = logging.getLogger(__name__)
+
+
+def get_cache_dir() -> pathlib.Path:
+    """Gets the directory used to cache data on disk between runs.
+
+    The directory can be set with the ``SN3S_CACHE_DIR`` environment variable.
+    Otherwise, ``splatnet3_scraper`` inside ``$XDG_CACHE_HOME`` is used,
+    falling back to ``~/.cache/splatnet3_scraper``. The directory is not
+    created by this function.
+
+    Returns:
+        pathlib.Path: The cache directory.
+    """
+    env_dir = os.environ.get(CACHE_DIR_ENV_VAR)
+    if env_dir:
+        return pathlib.Path(env_dir)
+    xdg_cache_home = os.environ.get("XDG_CACHE_HOME")
+    base_dir = (
+        pathlib.Path(xdg_cache_home)
+        if xdg_cache_home
+        else pathlib.Path.home() / ".cache"
+    )
+    return base_dir / "splatnet3_scraper"
+
+
+def read_cache(name: str, ttl: float) -> Any | None:
+    """Reads a JSON value from the disk cache if it is fresh enough.
+
+    Freshness is determined by the modification time of the cache file. Any
+    error while reading the file, including a corrupt file, is treated as a
+    cache miss.
+
+    Args:
+        name (str): The name of the cache file within the cache directory.
+        ttl (float): The maximum age of the cache file, in seconds.
+
+    Returns:
+        Any | None: The cached value, or None if the cache file is missing,
+            stale, or unreadable.
+    """
+    path = get_cache_dir() / name
+    try:
+        if time.time() - path.stat().st_mtime > ttl:
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_cache(name: str, data: Any) -> None:
+    """Writes a JSON value to the disk cache.
+
+    The value is first written to a temporary file in the cache directory and
+    then moved into place with ``os.replace``, so concurrent readers never see
+    a partially written file. Failing to write the cache is logged and
+    otherwise ignored, as the cache is only an optimization.
+
+    Args:
+        name (str): The name of the cache file within the cache directory.
+        data (Any): The JSON serializable value to cache.
+    """
+    cache_dir = get_cache_dir()
+    tmp_path: str | None = None
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(
+            dir=cache_dir, prefix=name, suffix=".tmp"
+        )
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, cache_dir / name)
+    except (OSError, TypeError, ValueError) as e:
+        logger.debug("Failed to write cache file %s: %s", name, e)
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
@@ -7,10 +7,25 @@ from functools import lru_cache
 import requests
 
 from splatnet3_scraper.constants import GRAPH_QL_REFERENCE_URL
+from splatnet3_scraper.utils.disk_cache import read_cache, write_cache
 
 fallback_path = (
     pathlib.Path(__file__).parent.parent / "splatnet3_webview_data.json"
 )
+HASH_DATA_TTL = 15 * 60
+HASH_DATA_CACHE_NAME = "splatnet3_webview_data.json"
+HASH_DATA_TIMEOUT = 5
+
+# Shared session so repeated refreshes reuse the keep-alive connection instead
+# of paying for a new TCP and TLS handshake every time
+_session = requests.Session()
+_session.headers.update({"Accept-Encoding": "gzip"})
+_session.mount(
+    "https://",
+    requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=8),
+)
+
+_fallback_hash_data: tuple[dict, str] | None = None
 
 
 @lru_cache()
@@ -24,7 +39,13 @@ def get_hash_data(
     parses it to get the hashes for the queries. The initial request
     response contains two keys: ``hash_map`` and ``version``. Both of these
     are returned as a tuple, with the first element being the ``hash_map``
-    and the second element being the ``version``.
+    and the second element being the ``version``. The request is made through
+    a module-level ``requests.Session`` so that the connection is reused
+    across refreshes.
+
+    When the default URL is used, the hash data is also cached on disk for 15
+    minutes so that short-lived processes do not need to download it on every
+    start. See ``get_cache_dir`` for the location of the cache.
 
     Args:
         url (str | None): The URL to get the hash data from. If None, the
@@ -45,31 +66,55 @@ def get_hash_data(
     """
     del ttl_hash
 
-    request_url = url or GRAPH_QL_REFERENCE_URL
-    response = requests.get(request_url).json()
-    return response["graphql"]["hash_map"], response["version"]
-
+    if url is None:
+        cached = read_cache(HASH_DATA_CACHE_NAME, HASH_DATA_TTL)
+        if cached is not None:
+            try:
+                return cached["graphql"]["hash_map"], cached["version"]
+            except (KeyError, TypeError):
+                logging.debug("Ignoring malformed hash data cache")
 
-def get_ttl_hash(expiry_time_seconds: float = 15 * 60) -> int:
+    request_url = url or GRAPH_QL_REFERENCE_URL
+    response = _session.get(request_url, timeout=HASH_DATA_TIMEOUT).json()
+    hash_map, version = response["graphql"]["hash_map"], response["version"]
+    # Only persist usable data, an empty hash map triggers the fallback
+    if url is None and hash_map:
+        write_cache(
+            HASH_DATA_CACHE_NAME,
+            {"graphql": {"hash_map": hash_map}, "version": version},
+        )
+    return hash_map, version
+
+
+def get_ttl_hash(expiry_time_seconds: float = HASH_DATA_TTL) -> int:
     return round(time.time() / expiry_time_seconds)
 
 
-@lru_cache()
 def get_fallback_hash_data() -> tuple[dict, str]:
     """Gets the fallback hash data for the GraphQL queries.
 
     Loads the fallback hash data from the ``splatnet3_webview_data.json`` file
-    and parses it to get the hashes for the queries.
+    and parses it to get the hashes for the queries. The file is only read on
+    the first call, the result is kept in a module-level variable so later
+    calls are a single check instead of going through a cache wrapper.
 
     Returns:
         tuple[dict, str]:
             dict: The hash map for the GraphQL queries.
             str: The version of the hash map.
     """
+    global _fallback_hash_data
+    if _fallback_hash_data is not None:
+        return _fallback_hash_data
+
     with open(fallback_path, "r") as f:
         FALLBACK_DATA = json.load(f)
 
-    return FALLBACK_DATA["graphql"]["hash_map"], FALLBACK_DATA["version"]
+    _fallback_hash_data = (
+        FALLBACK_DATA["graphql"]["hash_map"],
+        FALLBACK_DATA["version"],
+    )
+    return _fallback_hash_data
 
 
 def get_splatnet_hashes(url: str | None = None) -> dict[str, str]:
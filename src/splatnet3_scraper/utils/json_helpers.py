@@ -1,11 +1,45 @@
 import re
-from typing import Any, TypeAlias, cast
+from functools import lru_cache
+from sys import intern
+from typing import Any, Callable, Iterator, TypeAlias, cast
 
 PathType: TypeAlias = str | int | tuple[str | int, ...]
 
 json_splitter_re = re.compile(r"[\;\.]")
 
 
+@lru_cache(maxsize=4096)
+def _split_key(key: str) -> tuple[tuple[str | int, ...], tuple[str, ...]]:
+    """Splits a linearized key into its subkeys and the splitters between them
+    in a single scan. Subkeys that follow a semicolon are list indices and are
+    returned as integers. Linearized headers repeat across rows, so results
+    are cached per key.
+
+    Args:
+        key (str): The linearized key, in the format of
+            "key1.key2;index1.key3".
+
+    Returns:
+        tuple[str | int, ...]: The subkeys of the key.
+        tuple[str, ...]: The splitters found between the subkeys, either "."
+            or ";".
+    """
+    subkeys: list[str | int] = []
+    splitters: list[str] = []
+    start = 0
+    is_index = False
+    for match in json_splitter_re.finditer(key):
+        subkey = key[start : match.start()]
+        subkeys.append(int(subkey) if is_index else subkey)
+        splitter = match.group()
+        splitters.append(splitter)
+        is_index = splitter == ";"
+        start = match.end()
+    subkey = key[start:]
+    subkeys.append(int(subkey) if is_index else subkey)
+    return tuple(subkeys), tuple(splitters)
+
+
 def linearize_json(
     json_data: dict[str, Any]
 ) -> tuple[tuple[str, ...], list[Any]]:
@@ -35,6 +69,11 @@ def linearize_json(
     ...     [1, 2, 3, 4, 5],
     ... )
 
+    The object is walked once to collect its values and its structural schema.
+    The keys are built from the schema and cached, so objects that share the
+    same shape, such as many battles from the same query, only pay for
+    building the key strings once.
+
     Args:
         json_data (dict[str, Any]): The JSON object to linearize.
 
@@ -45,35 +84,100 @@ def linearize_json(
         list[Any]: The values of the JSON object. The values are in the same
             order as the keys.
     """
-    keys = []
-    values = []
+    values: list[Any] = []
+    schema = _linearize_schema(json_data, values.append)
+    return _schema_keys(schema), values
 
+
+# A schema is a tuple with one entry per key of a dictionary. Scalar values are
+# represented by their key, dictionaries by ``(key, 0, schema)`` and lists by
+# ``(key, 1, items)`` where each item is either None for a scalar or the schema
+# of a dictionary.
+Schema: TypeAlias = tuple[Any, ...]
+
+
+def _linearize_schema(
+    json_data: dict[str, Any], values_append: Callable[[Any], None]
+) -> Schema:
+    """Walks a JSON object once, appending its values in linearized order and
+    returning the structural schema of the object. The schema does not
+    contain any values, so responses with the same shape produce equal
+    schemas and can share the same linearized keys.
+
+    Only plain ``dict`` and ``list`` containers, as produced by decoding JSON,
+    are descended into. Dispatching on the exact type keeps the per-node cost
+    of the walk down, since it runs once for every value in the response.
+
+    Args:
+        json_data (dict[str, Any]): The JSON object to walk.
+        values_append (Callable[[Any], None]): The ``append`` method of the
+            list that the values are collected into.
+
+    Returns:
+        Schema: The structural schema of the JSON object.
+    """
+    _dict = dict
+    _list = list
+    schema: list[Any] = []
+    schema_append = schema.append
     for key, value in json_data.items():
-        if isinstance(value, dict):
-            sub_keys, sub_values = linearize_json(value)
-            keys.extend([(key + "." + sub_key) for sub_key in sub_keys])
-            values.extend(sub_values)
-        elif isinstance(value, list):
-            for i, item in enumerate(value):
-                if isinstance(item, dict):
-                    sub_keys, sub_values = linearize_json(item)
-                    keys.extend(
-                        [
-                            (key + ";" + str(i) + "." + sub_key)
-                            for sub_key in sub_keys
-                        ]
-                    )
-                    values.extend(sub_values)
+        value_type = type(value)
+        if value_type is _dict:
+            schema_append((key, 0, _linearize_schema(value, values_append)))
+        elif value_type is _list:
+            items: list[Schema | None] = []
+            items_append = items.append
+            for item in value:
+                if type(item) is _dict:
+                    items_append(_linearize_schema(item, values_append))
                 else:
-                    keys.append(key + ";" + str(i))
-                    values.append(item)
+                    items_append(None)
+                    values_append(item)
+            schema_append((key, 1, tuple(items)))
         else:
-            keys.append(key)
-            values.append(value)
+            schema_append(key)
+            values_append(value)
+    return tuple(schema)
+
+
+@lru_cache(maxsize=256)
+def _schema_keys(schema: Schema) -> tuple[str, ...]:
+    """Builds the linearized keys for a structural schema. Results are cached,
+    so the key strings are only built, and interned, the first time a given
+    shape, or any nested shape, is seen.
+
+    Args:
+        schema (Schema): The schema returned by ``_linearize_schema``.
 
-    # Turn the keys into an immutable tuple so it can be hashed
-    out_keys = tuple(keys)
-    return out_keys, values
+    Returns:
+        tuple[str, ...]: The linearized keys, in the same order as the values
+            collected while building the schema.
+    """
+    keys: list[str] = []
+    keys_append = keys.append
+    keys_extend = keys.extend
+    for entry in schema:
+        if not isinstance(entry, tuple):
+            keys_append(entry)
+            continue
+        key, is_list, sub_schema = entry
+        if not is_list:
+            prefix = f"{key}."
+            keys_extend(
+                prefix + sub_key for sub_key in _schema_keys(sub_schema)
+            )
+            continue
+        for i, item in enumerate(sub_schema):
+            if item is None:
+                keys_append(f"{key};{i}")
+            else:
+                prefix = f"{key};{i}."
+                keys_extend(prefix + sub_key for sub_key in _schema_keys(item))
+    # Keep the keys as an immutable tuple so they can be hashed. The keys are
+    # interned so that the same key coming from different shapes is a single
+    # object, which makes the header comparisons and column lookups done
+    # downstream identity hits
+    return tuple(map(intern, keys))
 
 
 def delinearize_json(
@@ -88,6 +192,13 @@ def delinearize_json(
     period indicates a nested object. The values are expected to be in the
     same order as the keys.
 
+    Each key is walked a single time, in the order given, and any missing
+    intermediate objects or lists are created on demand, so the keys do not
+    need to be sorted by depth first. Lists are indexed by the index stored in
+    the key and padded with None where needed, and a None value never replaces
+    an object or list that was already created, as those can show up as an
+    artifact of header merging.
+
     Args:
         keys (list[str]): The keys of the JSON object. The keys are expected
             to be in the format of "key1.key2;index1.key3" where the semicolon
@@ -98,66 +209,47 @@ def delinearize_json(
     Returns:
         dict[str, Any]: The JSON object created from the keys and values.
     """
-    json_data = {}
+    json_data: dict[str, Any] = {}
+    _list = list
 
-    # Sort the keys by depth
-    depths = [len(json_splitter_re.split(key)) for key in keys]
-    kvd = list(zip(keys, values, depths))
-    kvd = sorted(kvd, key=lambda x: (x[2], x[0]))
-    keys, values, _ = list(zip(*kvd))
-
-    # Delinearize
     for key, value in zip(keys, values):
         # If the key is split by a period, it's a nested object. If it's split
-        # by a semicolon, it's a list. Check which one is first.
-        subkeys = json_splitter_re.split(key)
-        splitters = json_splitter_re.findall(key)
-        if len(subkeys) == 1:
-            json_data[key] = value
-            continue
-        # If the key is split by a semicolon, turn the next key value into an
-        # integer
-        for i, splitter in enumerate(splitters):
-            if splitter == ";":
-                subkeys[i + 1] = int(subkeys[i + 1])
-
-        current = json_data
-        for i, splitter in enumerate(splitters):
-            # If the key already exists, move on to the next key
-            if isinstance(current, (list, dict)):
-                chosen_subkey = subkeys[i]
-                if isinstance(current, list):
-                    condition = len(current) > chosen_subkey
-                elif isinstance(current, dict):
-                    condition = chosen_subkey in current
-
-                if condition:
-                    next_obj = current[chosen_subkey]
-                    # Next object might be None as an artifact of header merging
-                    if next_obj is not None:
-                        current = next_obj
-                        continue
-            new_obj: dict | list = {} if (splitter == ".") else []
-
-            # Append or assign the new object to the current object depending
-            # on type.
-            if isinstance(current, list):
-                current.append(new_obj)
-            elif isinstance(current, dict):
-                current[subkeys[i]] = new_obj
-            # Mypy doesn't like that this is dynamically typed, so we have to
-            # ignore it. This is python, not C.
-            current = new_obj  # type: ignore
-        if isinstance(current, list):
-            current.append(value)
-        else:
-            current[subkeys[-1]] = value
+        # by a semicolon, it's a list.
+        subkeys, splitters = _split_key(key)
+        current: Any = json_data
+        for subkey, splitter in zip(subkeys, splitters):
+            # Every container here was built by this function, so comparing
+            # the exact type is enough and is cheaper than isinstance.
+            if type(current) is _list:
+                index = cast(int, subkey)
+                if index >= len(current):
+                    current.extend([None] * (index + 1 - len(current)))
+                next_obj = current[index]
+            else:
+                next_obj = current.get(subkey)
+            # Missing objects, or None as an artifact of header merging, are
+            # replaced by a new object or list depending on the splitter
+            if next_obj is None:
+                next_obj = {} if (splitter == ".") else []
+                current[subkey] = next_obj
+            current = next_obj
+
+        last_subkey = subkeys[-1]
+        if type(current) is _list:
+            index = cast(int, last_subkey)
+            if index >= len(current):
+                current.extend([None] * (index + 1 - len(current)))
+            elif value is None:
+                continue
+            current[index] = value
+        elif value is not None or last_subkey not in current:
+            current[last_subkey] = value
 
     return json_data
 
 
 def enumerate_all_paths(data: dict | list | Any) -> list[tuple[str | int, ...]]:
-    """Recursively enumerates all paths in the given data.
+    """Enumerates all paths in the given data.
 
     Given a dictionary or list, returns a list of all paths in the data. For
     example, given the following data:
@@ -187,7 +279,7 @@ def enumerate_all_paths(data: dict | list | Any) -> list[tuple[str | int, ...]]:
     Args:
         data (dict | list | Any): The data to enumerate. If the data is not a
             dictionary or list, an empty list is returned. Otherwise, the
-            function recurses into the data.
+            function walks the data depth-first.
 
     Returns:
         list[tuple[str | int, ...]]: A list of all paths in the given data.
@@ -197,18 +289,42 @@ def enumerate_all_paths(data: dict | list | Any) -> list[tuple[str | int, ...]]:
     if not isinstance(data, (dict, list)):
         return paths
 
-    members = data.items() if isinstance(data, dict) else enumerate(data)
-
-    for key, value in members:
-        key_tuple = (cast(str | int, key),)
-        paths.append(key_tuple)
-        subpaths = enumerate_all_paths(value)
-        for subpath in subpaths:
-            paths.append(key_tuple + subpath)
+    # Walk the data depth-first with an explicit stack of member iterators,
+    # sharing a single path list that is pushed to and popped from. Each
+    # visited node then costs exactly one tuple allocation.
+    path: list[str | int] = []
+    stack: list[Iterator[tuple[str | int, Any]]] = [_iter_members(data)]
+    while stack:
+        for key, value in stack[-1]:
+            path.append(key)
+            paths.append(tuple(path))
+            if isinstance(value, (dict, list)):
+                stack.append(_iter_members(value))
+                break
+            path.pop()
+        else:
+            stack.pop()
+            if path:
+                path.pop()
 
     return paths
 
 
+def _iter_members(data: dict | list) -> Iterator[tuple[str | int, Any]]:
+    """Returns an iterator over the ``(key, value)`` pairs of a dictionary or
+    the ``(index, value)`` pairs of a list.
+
+    Args:
+        data (dict | list): The dictionary or list to iterate over.
+
+    Returns:
+        Iterator[tuple[str | int, Any]]: The members of the data.
+    """
+    if isinstance(data, dict):
+        return iter(data.items())
+    return enumerate(data)
+
+
 def match_partial_path(
     data: dict[str, Any] | list, partial_path: PathType | list[PathType]
 ) -> list[tuple[str | int, ...]]:
@@ -300,40 +416,89 @@ def match_partial_path(
             integers, where strings correspond  to dictionary keys and integers
             correspond to list indices.
     """
+    # Enumerate and index the paths once, then reuse them for every partial
+    # path in the query.
+    paths = enumerate_all_paths(data)
+    return _match_indexed_paths(paths, _index_paths(paths), partial_path)
+
+
+def _index_paths(
+    paths: list[tuple[str | int, ...]]
+) -> dict[str | int, list[tuple[str | int, ...]]]:
+    """Groups the given paths by their last element, preserving the order in
+    which they were given.
+
+    Args:
+        paths (list[tuple[str | int, ...]]): The paths to index, as returned by
+            ``enumerate_all_paths``.
+
+    Returns:
+        dict[str | int, list[tuple[str | int, ...]]]: The paths, keyed by their
+            last element.
+    """
+    index: dict[str | int, list[tuple[str | int, ...]]] = {}
+    for path in paths:
+        index.setdefault(path[-1], []).append(path)
+    return index
+
+
+def _match_indexed_paths(
+    paths: list[tuple[str | int, ...]],
+    index: dict[str | int, list[tuple[str | int, ...]]],
+    partial_path: PathType | list[PathType],
+) -> list[tuple[str | int, ...]]:
+    """Matches a partial path against paths that were already enumerated and
+    indexed by their last element. See ``match_partial_path`` for the
+    matching rules.
+
+    Args:
+        paths (list[tuple[str | int, ...]]): All of the paths in the data.
+        index (dict[str | int, list[tuple[str | int, ...]]]): The same paths,
+            keyed by their last element, as returned by ``_index_paths``.
+        partial_path (PathType | list[PathType]): The partial path to match.
+
+    Returns:
+        list[tuple[str | int, ...]]: A list of all paths that match the given
+            partial path.
+    """
     if isinstance(partial_path, list):
         short_circuit: list[tuple[str | int, ...]] = []
         for path in partial_path:
-            short_circuit.extend(match_partial_path(data, path))
+            short_circuit.extend(_match_indexed_paths(paths, index, path))
         return short_circuit
 
     if isinstance(partial_path, (str, int)):
         partial_path = (partial_path,)
     partial_path = tuple(partial_path)
 
+    # If the partial path is empty, return an empty list
+    if not partial_path:
+        return []
+
+    # Only paths ending in the last element of the partial path can match,
+    # unless that element is the ":" wildcard, which can match any index.
+    last = partial_path[-1]
+    candidates = paths if last == ":" else index.get(last, [])
+
     # Check if the partial path contains the ":" character, which is used to
-    # denote to allow all indices in a list. If it does, then we need to
-    # enumerate all paths in the data and filter out the ones that match the
-    # partial path.
+    # denote to allow all indices in a list.
     branching_points = len([i for i, x in enumerate(partial_path) if x == ":"])
-
-    # If the partial path is empty, return an empty list
-    paths = enumerate_all_paths(data)
+    length = len(partial_path)
     out: list[tuple[str | int, ...]] = []
 
     if branching_points == 0:
-        for path in paths:
-            if path[-len(partial_path) :] == partial_path:
+        for path in candidates:
+            if path[-length:] == partial_path:
                 out.append(path)
 
         return out
 
-    # If the partial path contains the ":" character, then we need to
-    # enumerate all paths in the data and filter out the ones that match the
-    # partial path.
-    for path in paths:
+    # If the partial path contains the ":" character, then we need to filter
+    # out the candidates that match the partial path element by element.
+    for path in candidates:
         add_path = True
-        truncated_path = path[-len(partial_path) :]
-        if len(truncated_path) < len(partial_path):
+        truncated_path = path[-length:]
+        if len(truncated_path) < length:
             continue
         for idx, value in enumerate(partial_path):
             if value == truncated_path[idx]:
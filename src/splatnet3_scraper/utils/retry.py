@@ -1,4 +1,6 @@
 import logging
+import random
+import time
 from functools import wraps
 from typing import Callable, Literal, ParamSpec, Type, TypeAlias, TypeVar
 
@@ -12,6 +14,7 @@ def retry(
     times: int,
     exceptions: tuple[Type[Exception], ...] | Type[Exception] = Exception,
     call_on_fail: Callable[[], None] | None = None,
+    delays: tuple[float, ...] = (),
 ) -> Callable[[Callable[P, T]], Callable[P, T]]:
     """Decorator that retries a function a specified number of times if it
     raises a specific exception or tuple of exceptions.
@@ -23,30 +26,54 @@ def retry(
             or tuple of exceptions to catch. Defaults to Exception.
         call_on_fail (Callable[[], None] | None): Function to call if the
             function fails. If None, nothing will be called. Defaults to None.
+        delays (tuple[float, ...]): Base delay in seconds before each retry.
+            The last delay is reused once the tuple runs out, and each delay
+            is jittered down by up to half so concurrent callers do not retry
+            in lockstep. If empty, retries happen immediately. Defaults to an
+            empty tuple.
 
     Returns:
         Callable[[Callable[P, T]], Callable[P, T]]: The decorated function,
             which will retry the function if it raises an exception.
     """
 
+    # Normalize the exceptions once, rather than on every call
+    exceptions_tuple = (
+        exceptions if isinstance(exceptions, tuple) else (exceptions,)
+    )
+
     def decorator(func: Callable[P, T]) -> Callable[P, T]:
+        # Nothing to retry, so there is no need to wrap the function at all
+        if times <= 0:
+            return func
+
+        func_name = func.__name__
+        total_attempts = times + 1
+
         @wraps(func)
         def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
-            for i in range(times):
+            attempt = 0
+            while True:
+                attempt += 1
                 try:
                     return func(*args, **kwargs)
-                except exceptions:
+                except exceptions_tuple:
+                    # Out of retries, re-raise the exception from the last
+                    # attempt rather than calling the function again
+                    if attempt == total_attempts:
+                        raise
                     logging.warning(
                         "%s failed on attempt %d of %d, retrying.",
-                        func.__name__,
-                        i + 1,
-                        times + 1,
+                        func_name,
+                        attempt,
+                        total_attempts,
                     )
                     if call_on_fail is not None:
                         logging.debug("Calling %s...", call_on_fail.__name__)
                         call_on_fail()
-
-            return func(*args, **kwargs)
+                    if delays:
+                        delay = delays[min(attempt, len(delays)) - 1]
+                        time.sleep(delay * random.uniform(0.5, 1.0))
 
         return wrapper
 
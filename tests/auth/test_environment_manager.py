@@ -47,6 +47,41 @@ class TestEnvironmentVariablesManager:
         with pytest.raises(KeyError):
             manager.variable_to_token("test_variable")
 
+    def test_variable_to_token_updates(self):
+        manager = EnvironmentVariablesManager()
+        manager.add_token("test_token", "test_variable")
+        assert manager.variable_to_token("test_variable") == "test_token"
+
+        manager.add_token("test_token", "test_variable_2")
+        assert manager.variable_to_token("test_variable_2") == "test_token"
+        with pytest.raises(KeyError):
+            manager.variable_to_token("test_variable")
+
+        manager.remove_token("test_token")
+        with pytest.raises(KeyError):
+            manager.variable_to_token("test_variable_2")
+
+    def test_variable_to_token_shared_variable(self):
+        manager = EnvironmentVariablesManager()
+        manager.add_token("test_token", "test_variable")
+        manager.add_token("test_token_2", "test_variable")
+        assert manager.variable_to_token("test_variable") == "test_token"
+
+        # The remaining token still resolves after the first one is removed
+        manager.remove_token("test_token")
+        assert manager.variable_to_token("test_variable") == "test_token_2"
+
+        # Same when the first token moves to another variable
+        manager.add_token("test_token", "test_variable")
+        assert manager.variable_to_token("test_variable") == "test_token_2"
+        manager.add_token("test_token_2", "test_variable_2")
+        assert manager.variable_to_token("test_variable") == "test_token"
+        assert manager.variable_to_token("test_variable_2") == "test_token_2"
+
+        manager.remove_token("test_token")
+        with pytest.raises(KeyError):
+            manager.variable_to_token("test_variable")
+
     def test_add_token(self):
         manager = EnvironmentVariablesManager()
         assert "test_token" not in manager.variable_names
@@ -1,6 +1,8 @@
+import base64
 import hashlib
-import os
+import secrets
 from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
 
 import pytest
 import requests
@@ -10,8 +12,13 @@ from splatnet3_scraper.auth.exceptions import (
     NintendoException,
     SplatNetException,
 )
+from splatnet3_scraper.auth import nso as nso_module
 from splatnet3_scraper.auth.nso import NSO
-from splatnet3_scraper.constants import APP_VERSION_FALLBACK, NXAPI_ZNCA_URL
+from splatnet3_scraper.constants import (
+    APP_VERSION_FALLBACK,
+    NSO_VERSION_ENV_VAR,
+    NXAPI_ZNCA_URL,
+)
 from tests.mock import MockResponse
 
 nso_path = "splatnet3_scraper.auth.nso.NSO"
@@ -52,16 +59,33 @@ class TestNSO:
     def test_new_instance(self):
         nso = NSO.new_instance()
 
-        nso_variables = nso.__dict__
-        for key in nso_variables:
+        assert not hasattr(nso, "__dict__")
+        for key in NSO.__slots__:
+            value = getattr(nso, key)
             if key == "session":
-                assert isinstance(nso_variables[key], requests.Session)
+                assert isinstance(value, requests.Session)
             elif key == "_f_token_function":
-                assert nso_variables[key] == nso.get_ftoken
-            elif key == "logger":
-                assert nso_variables[key].name == "splatnet3_scraper.auth.nso"
+                assert value == nso.get_ftoken
             else:
-                assert nso_variables[key] is None
+                assert value is None
+
+    def test_new_instance_adapter(self):
+        nso = NSO.new_instance()
+        adapter = nso.session.get_adapter("https://accounts.nintendo.com")
+        assert isinstance(adapter, requests.adapters.HTTPAdapter)
+        assert adapter._pool_connections == 8
+        assert adapter._pool_maxsize == 8
+        assert adapter.max_retries.total == 2
+        assert 503 in adapter.max_retries.status_forcelist
+
+        # Connections are pooled across instances, cookies are not
+        other = NSO.new_instance()
+        assert other.session is not nso.session
+        assert (
+            other.session.get_adapter("https://api.lp1.av5ja.srv.nintendo.net")
+            is adapter
+        )
+        assert other.session.cookies is not nso.session.cookies
 
     def test_generate_version(self, monkeypatch: pytest.MonkeyPatch):
         test_string = 'whats-new__latest__version">Version    5.0.0</span>'
@@ -79,9 +103,72 @@ class TestNSO:
             return MockResponse(200, text="")
 
         monkeypatch.setattr(requests.Session, "get", mock_get)
+        monkeypatch.setattr(nso_module, "read_cache", lambda *args: None)
         version = nso.get_version()
         assert version == APP_VERSION_FALLBACK
 
+    def test_generate_version_disk_cache(self, monkeypatch: pytest.MonkeyPatch):
+        test_string = 'whats-new__latest__version">Version    5.0.0</span>'
+        calls = 0
+
+        def mock_get(*args, **kwargs):
+            nonlocal calls
+            calls += 1
+            return MockResponse(200, text=test_string)
+
+        monkeypatch.setattr(requests.Session, "get", mock_get)
+        assert NSO.new_instance().get_version() == "5.0.0"
+        # A new instance reads the version from the disk cache
+        assert NSO.new_instance().get_version() == "5.0.0"
+        assert calls == 1
+
+    def test_version_disk_cache(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.delenv(NSO_VERSION_ENV_VAR, raising=False)
+
+        def mock_get(*args, **kwargs):
+            raise AssertionError("The version property must not scrape")
+
+        monkeypatch.setattr(requests.Session, "get", mock_get)
+        assert NSO.new_instance().version == APP_VERSION_FALLBACK
+
+        nso_module.write_cache(
+            nso_module.NSO_VERSION_CACHE_NAME, {"version": "5.0.0"}
+        )
+        assert NSO.new_instance().version == "5.0.0"
+
+    def test_version_env_var(self, monkeypatch: pytest.MonkeyPatch):
+        nso = NSO.new_instance()
+        monkeypatch.setenv(NSO_VERSION_ENV_VAR, "5.0.0")
+        assert nso.version == "5.0.0"
+
+    def test_generate_version_chunked(self, monkeypatch: pytest.MonkeyPatch):
+        test_string = (
+            "x" * 50
+            + 'whats-new__latest__version">Version    5.0.0</span>'
+            + "y" * 50
+        )
+        response = MockResponse(200, text=test_string)
+        chunks_read = 0
+
+        def iter_content(*args, **kwargs):
+            nonlocal chunks_read
+            for chunk in MockResponse.iter_content(response, *args, **kwargs):
+                chunks_read += 1
+                yield chunk
+
+        response.iter_content = iter_content
+
+        def mock_get(*args, **kwargs):
+            assert kwargs["stream"] is True
+            return response
+
+        monkeypatch.setattr(requests.Session, "get", mock_get)
+        monkeypatch.setattr(nso_module, "VERSION_CHUNK_SIZE", 16)
+        nso = NSO.new_instance()
+        assert nso.get_version() == "5.0.0"
+        # Stops reading once the version has been found
+        assert chunks_read < -(-len(test_string) // 16)
+
     # def test_version_property(self, monkeypatch: pytest.MonkeyPatch):
     #     test_string = 'whats-new__latest__version">Version    5.0.0</span>'
 
@@ -103,16 +190,36 @@ class TestNSO:
     #     assert version == "5.0.0"
     #     assert nso._version == "5.0.0"
 
+    @pytest.mark.parametrize(
+        "uri",
+        [
+            "npf71b963c1b7b6d119://auth#session_state=test_state"
+            "&session_token_code=test_code&state=test",
+            "npf71b963c1b7b6d119://auth#state=test"
+            "&session_state=test_state&session_token_code=test_code",
+            "npf71b963c1b7b6d119://auth#session_token_code=test_code",
+        ],
+        ids=["second", "last", "first"],
+    )
+    def test_parse_npf_uri(self, uri: str):
+        nso = NSO.new_instance()
+        assert nso.parse_npf_uri(uri) == "test_code"
+
+    def test_parse_npf_uri_missing(self):
+        nso = NSO.new_instance()
+        with pytest.raises(ValueError):
+            nso.parse_npf_uri("npf71b963c1b7b6d119://auth#state=test")
+
     def test_generate_new_state(
         self,
         monkeypatch,
         urand36: bytes,
         urand36_expected: bytes,
     ):
-        def mock_urandom(*args, **kwargs):
+        def mock_token_bytes(*args, **kwargs):
             return urand36
 
-        monkeypatch.setattr(os, "urandom", mock_urandom)
+        monkeypatch.setattr(secrets, "token_bytes", mock_token_bytes)
         nso = NSO.new_instance()
         encoded_str = urand36_expected
         assert nso.generate_new_state() == encoded_str
@@ -123,10 +230,10 @@ class TestNSO:
         urand36: bytes,
         urand36_expected: bytes,
     ):
-        def mock_urandom(*args, **kwargs):
+        def mock_token_bytes(*args, **kwargs):
             return urand36
 
-        monkeypatch.setattr(os, "urandom", mock_urandom)
+        monkeypatch.setattr(secrets, "token_bytes", mock_token_bytes)
         nso = NSO.new_instance()
         assert nso._state is None
         encoded_str = urand36_expected
@@ -134,10 +241,10 @@ class TestNSO:
         assert nso._state == encoded_str
 
         # Test short circuit
-        def mock_urandom(*args, **kwargs):
+        def mock_token_bytes(*args, **kwargs):
             raise Exception
 
-        monkeypatch.setattr(os, "urandom", mock_urandom)
+        monkeypatch.setattr(secrets, "token_bytes", mock_token_bytes)
         assert nso.state == encoded_str
         assert nso._state == encoded_str
 
@@ -147,10 +254,10 @@ class TestNSO:
         urand36: bytes,
         urand32_expected: bytes,
     ):
-        def mock_urandom(*args, **kwargs):
+        def mock_token_bytes(*args, **kwargs):
             return urand36[:32]
 
-        monkeypatch.setattr(os, "urandom", mock_urandom)
+        monkeypatch.setattr(secrets, "token_bytes", mock_token_bytes)
         nso = NSO.new_instance()
         encoded_str = urand32_expected
         assert nso.generate_new_verifier() == encoded_str
@@ -162,10 +269,10 @@ class TestNSO:
         urand36: bytes,
         urand32_expected: bytes,
     ):
-        def mock_urandom(*args, **kwargs):
+        def mock_token_bytes(*args, **kwargs):
             return urand36[:32]
 
-        monkeypatch.setattr(os, "urandom", mock_urandom)
+        monkeypatch.setattr(secrets, "token_bytes", mock_token_bytes)
         nso = NSO.new_instance()
         assert nso._verifier is None
         encoded_str = urand32_expected
@@ -173,10 +280,10 @@ class TestNSO:
         assert nso._verifier == encoded_str
 
         # Test short circuit
-        def mock_urandom(*args, **kwargs):
+        def mock_token_bytes(*args, **kwargs):
             raise Exception
 
-        monkeypatch.setattr(os, "urandom", mock_urandom)
+        monkeypatch.setattr(secrets, "token_bytes", mock_token_bytes)
         assert nso.verifier == encoded_str
         assert nso._verifier == encoded_str
 
@@ -189,6 +296,17 @@ class TestNSO:
         nso._session_token = "test"
         assert nso.session_token == "test"
 
+    def test_challenge(self):
+        nso = self.get_new_nso(verifier=b"test_verifier")
+        digest = hashlib.sha256(b"test_verifier").digest()
+        expected = base64.urlsafe_b64encode(digest).rstrip(b"=")
+        assert nso.challenge == expected
+        assert b"=" not in nso.challenge
+
+        # The challenge follows the verifier
+        nso._verifier = b"test_verifier_2"
+        assert nso.challenge != expected
+
     def test_login_url(
         self,
         monkeypatch,
@@ -222,6 +340,26 @@ class TestNSO:
         nso = NSO.new_instance()
         assert nso.generate_login_url() == "https://test.com/"
 
+    def test_login_url_query(self, monkeypatch: pytest.MonkeyPatch):
+        def mock_get(session, url, *args, **kwargs):
+            request = requests.Request("GET", url, params=kwargs["params"])
+            return MockResponse(200, url=request.prepare().url)
+
+        monkeypatch.setattr(requests.Session, "get", mock_get)
+        nso = self.get_new_nso(state=b"test+state", verifier=b"test_verifier")
+        url = nso.generate_login_url()
+        query = parse_qs(urlparse(url).query)
+        assert query == {
+            "redirect_uri": ["npf71b963c1b7b6d119://auth"],
+            "client_id": ["71b963c1b7b6d119"],
+            "scope": ["openid user user.birthday user.mii user.screenName"],
+            "response_type": ["session_token_code"],
+            "session_token_code_challenge_method": ["S256"],
+            "theme": ["login_form"],
+            "state": ["test+state"],
+            "session_token_code_challenge": [nso.challenge.decode()],
+        }
+
     def test_get_session_token(self, monkeypatch: pytest.MonkeyPatch):
         def mock_get(*args, **kwargs):
             return MockResponse(200, json={"session_token": "test"})
@@ -243,6 +381,35 @@ class TestNSO:
         assert isinstance(access_token, dict)
         assert access_token["access_token"] == "test"
 
+    @pytest.mark.parametrize(
+        "use_orjson",
+        [True, False],
+        ids=["orjson", "stdlib"],
+    )
+    def test_get_user_access_token_encoding(
+        self, use_orjson: bool, monkeypatch: pytest.MonkeyPatch
+    ):
+        sent = {}
+
+        def mock_post(*args, **kwargs):
+            sent.update(kwargs)
+            return MockResponse(200, json={"access_token": "test"})
+
+        if not use_orjson:
+            monkeypatch.setattr(nso_module, "orjson", None)
+        monkeypatch.setattr(requests.Session, "post", mock_post)
+        nso = self.get_new_nso()
+
+        access_token = nso.get_user_access_token("test")
+        assert access_token["access_token"] == "test"
+        if use_orjson:
+            assert "json" not in sent
+            assert isinstance(sent["data"], bytes)
+            assert b'"session_token":"test"' in sent["data"]
+        else:
+            assert "data" not in sent
+            assert sent["json"]["session_token"] == "test"
+
     def test_user_info(self, monkeypatch: pytest.MonkeyPatch):
         def mock_get(*args, **kwargs):
             return MockResponse(200, json={"test": "test"})
@@ -1,8 +1,11 @@
+import time
 from unittest.mock import MagicMock, patch
 
 import pytest
 
 from splatnet3_scraper.auth.tokens.constructor import TokenManagerConstructor
+from splatnet3_scraper.auth.tokens.keychain import TokenKeychain
+from splatnet3_scraper.auth.tokens.tokens import Token
 
 base_constructor_path = "splatnet3_scraper.auth.tokens.constructor"
 constructor_path = base_constructor_path + ".TokenManagerConstructor"
@@ -74,8 +77,11 @@ class TestConstructor:
             ) as mock_from_session_token,
         ):
             mock_regenerator.generate_gtoken.return_value.value = gtoken
-            mock_regenerator.generate_bullet_token.return_value.value = (
-                bullet_token
+            new_bullet_token = MagicMock()
+            new_bullet_token.value = bullet_token
+            mock_regenerator.generate_bullet_token.return_value = (
+                new_bullet_token,
+                None,
             )
             mock_from_session_token.return_value.nso = nso
             mock_from_session_token.return_value.f_token_url = f_token_url
@@ -105,12 +111,45 @@ class TestConstructor:
                 mock_regenerator.generate_bullet_token.assert_not_called()
             else:
                 mock_regenerator.generate_bullet_token.assert_called_once_with(
-                    nso, f_token_url, user_agent=user_agent
+                    nso,
+                    f_token_url,
+                    user_agent=user_agent,
+                    gtoken=manager.get_token.return_value,
                 )
+                manager.get_token.assert_called_once_with("gtoken")
             manager.add_token.assert_any_call(bullet_token, "bullet_token")
 
             assert manager == mock_from_session_token.return_value
 
+    def test_from_tokens_keeps_gtoken(self) -> None:
+        nso = MagicMock()
+        nso.session_token = "test_session_token"
+        nso._user_info = None
+        user_info = {"language": "en-US", "country": "US"}
+        nso.get_user_access_token.return_value = {"access_token": "access"}
+        nso.get_user_info.return_value = user_info
+        nso.get_bullet_token.return_value = "test_bullet_token"
+
+        with patch(
+            "splatnet3_scraper.auth.tokens.regenerator.TokenRegenerator"
+            ".generate_gtoken"
+        ) as mock_generate_gtoken:
+            manager = TokenManagerConstructor.from_tokens(
+                "test_session_token",
+                gtoken="test_gtoken",
+                nso=nso,
+                user_agent="test_user_agent",
+            )
+
+        # The bullet token is generated from the given gtoken, without
+        # generating another gtoken
+        mock_generate_gtoken.assert_not_called()
+        nso.get_bullet_token.assert_called_once_with(
+            "test_gtoken", user_info, "test_user_agent"
+        )
+        assert manager.get_token("gtoken").value == "test_gtoken"
+        assert manager.get_token("bullet_token").value == "test_bullet_token"
+
     @pytest.mark.parametrize(
         "with_env_manager",
         [True, False],
@@ -160,3 +199,68 @@ class TestConstructor:
                 "env"
             )
             assert manager == mock_from_tokens.return_value
+
+    @pytest.mark.parametrize(
+        "saved_session_token, gtoken_age, expect_reuse",
+        [
+            ("test_session_token", 60, True),
+            ("other_session_token", 60, False),
+            ("test_session_token", 1e6, False),
+        ],
+        ids=["reused", "other_session", "expired"],
+    )
+    def test_from_env_keychain(
+        self,
+        saved_session_token: str,
+        gtoken_age: float,
+        expect_reuse: bool,
+        tmp_path,
+    ) -> None:
+        path = str(tmp_path / "keychain.json")
+        gtoken_timestamp = time.time() - gtoken_age
+        TokenKeychain.from_list(
+            [
+                Token(saved_session_token, "session_token", time.time()),
+                Token("cached_gtoken", "gtoken", gtoken_timestamp),
+            ]
+        ).save(path)
+
+        env_manager = MagicMock()
+        env_manager.get_all.return_value = {
+            "session_token": "test_session_token",
+            "bullet_token": "env_bullet_token",
+        }
+        manager = MagicMock()
+        manager.get_token.side_effect = lambda name: Token(
+            "cached_gtoken" if expect_reuse else "new_gtoken", name, 0
+        )
+        with patch(
+            constructor_path + ".from_tokens", return_value=manager
+        ) as mock_from_tokens:
+            TokenManagerConstructor.from_env(
+                env_manager=env_manager, keychain_path=path
+            )
+
+        expected_gtoken = "cached_gtoken" if expect_reuse else None
+        assert mock_from_tokens.call_args.kwargs["gtoken"] == expected_gtoken
+        assert (
+            mock_from_tokens.call_args.kwargs["bullet_token"]
+            == "env_bullet_token"
+        )
+        if expect_reuse:
+            # The reused token keeps its original timestamp
+            reused = manager.add_token.call_args.args[0]
+            assert reused.timestamp == gtoken_timestamp
+        else:
+            manager.add_token.assert_not_called()
+        manager.keychain.save.assert_called_once_with(path)
+
+    def test_from_env_keychain_missing(self, tmp_path) -> None:
+        env_manager = MagicMock()
+        env_manager.get_all.return_value = {"session_token": "test"}
+        with patch(constructor_path + ".from_tokens") as mock_from_tokens:
+            TokenManagerConstructor.from_env(
+                env_manager=env_manager,
+                keychain_path=str(tmp_path / "missing.json"),
+            )
+        assert mock_from_tokens.call_args.kwargs["gtoken"] is None
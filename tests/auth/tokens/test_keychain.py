@@ -39,6 +39,39 @@ class TestTokenKeychain:
 
         assert keychain.get(self.token.name, full_token=True) == self.token
 
+    def test_get_expired(self) -> None:
+        token = Token("test_value", "gtoken", test_date_float)
+        keychain = TokenKeychain.from_list([token])
+        with freezegun.freeze_time(test_date_str) as frozen_time:
+            assert keychain.get("gtoken", allow_expired=False) == "test_value"
+
+            frozen_time.tick(token.expiration - test_date_float + 1)
+            assert keychain.get("gtoken") == "test_value"
+            assert keychain.get("gtoken", full_token=True) == token
+            with pytest.raises(ValueError, match="expired"):
+                keychain.get("gtoken", allow_expired=False)
+
+    def test_save_load(self, tmp_path) -> None:
+        path = str(tmp_path / "keychain.json")
+        keychain = TokenKeychain.from_list(
+            [self.token, Token("test_gtoken", "gtoken", test_date_float)]
+        )
+        keychain.save(path)
+        assert list(tmp_path.iterdir()) == [tmp_path / "keychain.json"]
+        assert (tmp_path / "keychain.json").stat().st_mode & 0o077 == 0
+
+        loaded = TokenKeychain.load(path)
+        assert loaded.to_dict() == keychain.to_dict()
+        for name, token in keychain.keychain.items():
+            assert loaded.keychain[name].timestamp == token.timestamp
+            assert loaded.keychain[name].expiration == token.expiration
+
+    def test_load_invalid(self, tmp_path) -> None:
+        path = tmp_path / "keychain.json"
+        path.write_text('[{"name": "test_name"}]')
+        with pytest.raises(ValueError):
+            TokenKeychain.load(str(path))
+
     def test_generate_token(self) -> None:
         keychain = TokenKeychain()
         with freezegun.freeze_time(test_date_str) as frozen_time:
@@ -94,3 +127,15 @@ class TestTokenKeychain:
             assert keychain.get(self.token.name) == "overwrite_value"
             assert overwrite_token.timestamp == new_timestamp
             assert overwrite_token != new_token
+
+    def test_add_tokens(self) -> None:
+        keychain = TokenKeychain()
+        keychain.add_token("old_value", "test_name")
+        tokens = [
+            Token("new_value", "test_name", test_date_float),
+            Token("other_value", "other_name", test_date_float),
+        ]
+        added = keychain.add_tokens(iter(tokens))
+        assert added == tokens
+        assert keychain.get("test_name") == "new_value"
+        assert keychain.get("other_name") == "other_value"
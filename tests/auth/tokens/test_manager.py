@@ -1,9 +1,12 @@
+import threading
 from unittest.mock import MagicMock, PropertyMock, patch
 
 import pytest
 
 from splatnet3_scraper.auth.tokens.manager import ManagerOrigin, TokenManager
-from splatnet3_scraper.constants import TOKENS
+from splatnet3_scraper.auth.tokens.regenerator import TokenBundle
+from splatnet3_scraper.auth.tokens.tokens import Token
+from splatnet3_scraper.constants import DEFAULT_USER_AGENT, TOKENS
 
 ftoken_urls = [
     "ftoken_url_1",
@@ -137,6 +140,17 @@ class TestTokenManager:
         assert mock_token_manager.origin.origin == "test_origin"
         assert mock_token_manager.origin.data == "test_data"
 
+    def test_flag_origin_unchanged(
+        self, mock_token_manager: TokenManager
+    ) -> None:
+        mock_token_manager.flag_origin("test_origin", "test_data")
+        origin = mock_token_manager.origin
+        mock_token_manager.flag_origin("test_origin", "test_data")
+        assert mock_token_manager.origin is origin
+        mock_token_manager.flag_origin("test_origin", "other_data")
+        assert mock_token_manager.origin is not origin
+        assert mock_token_manager.origin.data == "other_data"
+
     @pytest.mark.parametrize(
         "token_name",
         [
@@ -189,6 +203,22 @@ class TestTokenManager:
         else:
             assert nso._session_token != token.value
 
+    def test_add_tokens(self, mock_token_manager: TokenManager) -> None:
+        tokens = [
+            Token(f"{name}_value", name, 0.0)
+            for name in (
+                TOKENS.SESSION_TOKEN,
+                TOKENS.GTOKEN,
+                TOKENS.BULLET_TOKEN,
+            )
+        ]
+        nso = mock_token_manager.nso
+        mock_token_manager.keychain.add_tokens.return_value = tokens
+        mock_token_manager.add_tokens(tokens)
+        mock_token_manager.keychain.add_tokens.assert_called_once_with(tokens)
+        assert nso._session_token == "session_token_value"
+        assert nso._gtoken == "gtoken_value"
+
     @pytest.mark.parametrize(
         "raise_exception",
         [True, False],
@@ -213,7 +243,7 @@ class TestTokenManager:
 
         token = mock_token_manager.get_token("test")
         mock_token_manager.keychain.get.assert_called_once_with(
-            "test", full_token=True
+            "test", full_token=True, allow_expired=True
         )
         assert token == mock_token
 
@@ -223,13 +253,133 @@ class TestTokenManager:
                 base_token_manager_path
                 + ".TokenRegenerator.generate_all_tokens"
             ) as mock_generate_all_tokens,
-            patch(token_manager_path + ".add_token") as mock_add_token,
+            patch(token_manager_path + ".add_tokens") as mock_add_tokens,
         ):
-            mock_generate_all_tokens.return_value = {
-                f"test_token_{i}": f"test_value_{i}" for i in range(15)
-            }
+            mock_generate_all_tokens.return_value = TokenBundle(
+                MagicMock(), MagicMock()
+            )
             mock_token_manager.regenerate_tokens()
             mock_generate_all_tokens.assert_called_once_with(
                 mock_token_manager.nso, mock_token_manager.f_token_url
             )
-            assert mock_add_token.call_count == 15
+            mock_add_tokens.assert_called_once_with(
+                mock_generate_all_tokens.return_value
+            )
+
+    @pytest.mark.parametrize(
+        "has_gtoken",
+        [True, False],
+        ids=["has_gtoken", "no_gtoken"],
+    )
+    @pytest.mark.parametrize(
+        "mints_gtoken",
+        [True, False],
+        ids=["mints_gtoken", "no_new_gtoken"],
+    )
+    def test_generate_bullet_token(
+        self,
+        mock_token_manager: TokenManager,
+        has_gtoken: bool,
+        mints_gtoken: bool,
+    ) -> None:
+        gtoken = MagicMock()
+        bullet_token = MagicMock()
+        new_gtoken = MagicMock() if mints_gtoken else None
+
+        def simulate_get_token(*args, **kwargs):
+            if not has_gtoken:
+                raise ValueError("test")
+            return gtoken
+
+        with (
+            patch(
+                base_token_manager_path + ".TokenRegenerator"
+            ) as mock_regenerator,
+            patch(
+                token_manager_path + ".get_token",
+                side_effect=simulate_get_token,
+            ) as mock_get_token,
+            patch(token_manager_path + ".add_token") as mock_add_token,
+        ):
+            mock_regenerator.generate_bullet_token.return_value = (
+                bullet_token,
+                new_gtoken,
+            )
+            mock_token_manager.generate_bullet_token()
+
+            mock_get_token.assert_called_once_with(
+                TOKENS.GTOKEN, allow_expired=False
+            )
+            mock_regenerator.generate_bullet_token.assert_called_once_with(
+                mock_token_manager.nso,
+                mock_token_manager.f_token_url,
+                DEFAULT_USER_AGENT,
+                gtoken=gtoken if has_gtoken else None,
+            )
+            if mints_gtoken:
+                assert mock_add_token.call_count == 2
+                mock_add_token.assert_any_call(new_gtoken)
+            else:
+                mock_add_token.assert_called_once()
+            mock_add_token.assert_called_with(bullet_token)
+
+    def test_regenerate_tokens_single_flight(
+        self, mock_token_manager: TokenManager
+    ) -> None:
+        started = threading.Event()
+        second_waiting = threading.Event()
+        lock = threading.Lock()
+        callers = 0
+
+        class SignallingLock:
+            """Real lock that signals once a second caller reaches it. The
+            manager reads the regeneration counter before taking the lock, so
+            by then the second caller has seen the same stale tokens.
+            """
+
+            def __enter__(self) -> None:
+                nonlocal callers
+                callers += 1
+                if callers == 2:
+                    second_waiting.set()
+                lock.acquire()
+
+            def __exit__(self, *args) -> None:
+                lock.release()
+
+        mock_token_manager._regenerate_lock = SignallingLock()
+
+        def slow_generate_all_tokens(*args, **kwargs):
+            started.set()
+            # Hold the first regeneration until the second caller is waiting
+            assert second_waiting.wait(5)
+            return TokenBundle(MagicMock(), MagicMock())
+
+        with (
+            patch(
+                base_token_manager_path
+                + ".TokenRegenerator.generate_all_tokens",
+                side_effect=slow_generate_all_tokens,
+            ) as mock_generate_all_tokens,
+            patch(token_manager_path + ".add_tokens"),
+        ):
+            first = threading.Thread(
+                target=mock_token_manager.regenerate_tokens
+            )
+            first.start()
+            assert started.wait(5)
+            # Saw the same stale tokens, so it must wait and then reuse the
+            # result of the first regeneration
+            second = threading.Thread(
+                target=mock_token_manager.regenerate_tokens
+            )
+            second.start()
+            first.join(5)
+            second.join(5)
+            assert not first.is_alive() and not second.is_alive()
+
+            assert mock_generate_all_tokens.call_count == 1
+
+            # A later call regenerates again
+            mock_token_manager.regenerate_tokens()
+            assert mock_generate_all_tokens.call_count == 2
@@ -4,9 +4,23 @@ from unittest.mock import MagicMock, patch
 import freezegun
 import pytest
 
-from splatnet3_scraper.auth.exceptions import FTokenException
-from splatnet3_scraper.auth.tokens.regenerator import TokenRegenerator
-from splatnet3_scraper.constants import GRAPH_QL_REFERENCE_URL, TOKENS
+from splatnet3_scraper.auth.exceptions import (
+    FTokenException,
+    NintendoException,
+    SplatNetException,
+)
+from splatnet3_scraper.auth.tokens.regenerator import (
+    VALIDATION_TIMEOUT,
+    TokenBundle,
+    TokenRegenerator,
+    _home_query_body,
+)
+from splatnet3_scraper.auth.tokens.tokens import Token
+from splatnet3_scraper.constants import (
+    DEFAULT_USER_AGENT,
+    GRAPH_QL_REFERENCE_URL,
+    TOKENS,
+)
 
 test_date_str = "2023-01-01 00:00:00"
 base_regen_path = "splatnet3_scraper.auth.tokens.regenerator"
@@ -51,45 +65,103 @@ class TestTokenRegenerator:
             assert gtoken.timestamp == time.time()
 
     @pytest.mark.parametrize(
-        "with_gtoken",
-        [True, False],
-        ids=["with_gtoken", "without_gtoken"],
+        "gtoken_source",
+        ["nso", "none", "argument", "argument_no_user_info"],
+        ids=[
+            "nso_gtoken",
+            "without_gtoken",
+            "gtoken_argument",
+            "gtoken_argument_no_user_info",
+        ],
     )
     @freezegun.freeze_time(test_date_str)
-    def test_generate_bullet_token(self, with_gtoken: bool) -> None:
+    def test_generate_bullet_token(self, gtoken_source: str) -> None:
         nso = MagicMock()
-        if with_gtoken:
-            nso._user_info = {"test": "test"}
-            nso._gtoken = "test_gtoken"
+        user_info = {"language": "en-US", "country": "US"}
+        if gtoken_source in ("nso", "argument"):
+            nso._user_info = user_info
+            nso._gtoken = "nso_gtoken"
         else:
             nso._user_info = None
+        nso.get_user_access_token.return_value = {"access_token": "access"}
+        nso.get_user_info.return_value = user_info
 
-        test_gtoken = MagicMock()
-        test_gtoken.value = "test_gtoken"
-        with (
-            patch(regen_path + ".generate_gtoken") as mock_generate_gtoken,
-            patch(base_regen_path + ".Token") as mock_token,
-        ):
-            mock_generate_gtoken.return_value = test_gtoken
+        given_gtoken = Token("given_gtoken", TOKENS.GTOKEN, time.time())
+        new_gtoken = Token("new_gtoken", TOKENS.GTOKEN, time.time())
+
+        def simulate_generate_gtoken(*args, **kwargs):
+            nso._user_info = user_info
+            return new_gtoken
+
+        with patch(
+            regen_path + ".generate_gtoken",
+            side_effect=simulate_generate_gtoken,
+        ) as mock_generate_gtoken:
             nso.get_bullet_token.return_value = "test_bullet_token"
-            TokenRegenerator.generate_bullet_token(nso, self.ftokens_url)
-
-            if with_gtoken:
-                mock_generate_gtoken.assert_not_called()
-                mock_token.assert_called_once_with(
-                    "test_bullet_token",
-                    TOKENS.BULLET_TOKEN,
-                    time.time(),
-                )
-            else:
-                mock_generate_gtoken.assert_called_once_with(
-                    nso, self.ftokens_url
-                )
-                mock_token.assert_called_once_with(
-                    "test_bullet_token",
-                    TOKENS.BULLET_TOKEN,
-                    time.time(),
-                )
+            bullet_token, minted = TokenRegenerator.generate_bullet_token(
+                nso,
+                self.ftokens_url,
+                gtoken=(
+                    given_gtoken
+                    if gtoken_source.startswith("argument")
+                    else None
+                ),
+            )
+
+        assert bullet_token.value == "test_bullet_token"
+        assert bullet_token.name == TOKENS.BULLET_TOKEN
+        assert bullet_token.timestamp == time.time()
+
+        if gtoken_source == "none":
+            mock_generate_gtoken.assert_called_once_with(nso, self.ftokens_url)
+            assert minted is new_gtoken
+            expected_gtoken = "new_gtoken"
+        else:
+            mock_generate_gtoken.assert_not_called()
+            assert minted is None
+            expected_gtoken = (
+                "nso_gtoken" if gtoken_source == "nso" else "given_gtoken"
+            )
+
+        if gtoken_source == "argument_no_user_info":
+            # Only the user info is fetched, without any ftoken requests
+            nso.get_user_access_token.assert_called_once_with(nso.session_token)
+            nso.get_user_info.assert_called_once_with("access")
+            assert nso._user_info == user_info
+        else:
+            nso.get_user_access_token.assert_not_called()
+
+        nso.get_bullet_token.assert_called_once_with(
+            expected_gtoken, user_info, DEFAULT_USER_AGENT
+        )
+
+    def test_generate_bullet_token_no_access_token(self) -> None:
+        nso = MagicMock()
+        nso._user_info = None
+        nso.get_user_access_token.return_value = {"error": "invalid"}
+        gtoken = Token("given_gtoken", TOKENS.GTOKEN, time.time())
+        with pytest.raises(NintendoException):
+            TokenRegenerator.generate_bullet_token(
+                nso, self.ftokens_url, gtoken=gtoken
+            )
+        nso.get_bullet_token.assert_not_called()
+
+    def test_generate_bullet_token_retry(self) -> None:
+        nso = MagicMock()
+        nso._user_info = {"test": "test"}
+        nso._gtoken = "test_gtoken"
+        nso.get_bullet_token.side_effect = [
+            SplatNetException("test"),
+            "test_bullet_token",
+        ]
+        with patch("splatnet3_scraper.utils.retry.time.sleep") as mock_sleep:
+            token, _ = TokenRegenerator.generate_bullet_token(
+                nso, self.ftokens_url
+            )
+        assert token.value == "test_bullet_token"
+        assert nso.get_bullet_token.call_count == 2
+        mock_sleep.assert_called_once()
+        assert 0.2 <= mock_sleep.call_args.args[0] <= 0.4
 
     def test_generate_all_tokens(self) -> None:
         nso = MagicMock()
@@ -98,18 +170,18 @@ class TestTokenRegenerator:
             patch(regen_path + ".generate_bullet_token") as mock_bullet,
         ):
             mock_gtoken.return_value = "test_gtoken"
+            mock_bullet.return_value = ("test_bullet_token", None)
             expected = TokenRegenerator.generate_all_tokens(
                 nso, self.ftokens_url, "test_user_agent"
             )
             mock_gtoken.assert_called_once_with(nso, self.ftokens_url)
             mock_bullet.assert_called_once_with(
-                nso, self.ftokens_url, "test_user_agent"
+                nso, self.ftokens_url, "test_user_agent", gtoken="test_gtoken"
             )
 
-            assert expected == {
-                TOKENS.GTOKEN: "test_gtoken",
-                TOKENS.BULLET_TOKEN: mock_bullet.return_value,
-            }
+            assert expected == TokenBundle("test_gtoken", "test_bullet_token")
+            assert expected.gtoken == "test_gtoken"
+            assert expected.bullet_token == "test_bullet_token"
 
     @pytest.mark.parametrize(
         "valid_gtoken",
@@ -140,20 +212,19 @@ class TestTokenRegenerator:
         with (
             patch(regen_path + ".generate_gtoken") as mock_gtoken,
             patch(regen_path + ".generate_bullet_token") as mock_bullet,
-            patch(base_regen_path + ".requests") as mock_requests,
             patch(base_regen_path + ".queries") as mock_queries,
             patch(regen_path + ".generate_all_tokens") as mock_all_tokens,
         ):
             mock_gtoken.return_value = gtoken
-            mock_bullet.return_value = bullet_token
-            mock_requests.post.return_value = response
+            mock_bullet.return_value = (bullet_token, None)
+            nso.session.post.return_value = response
 
             if valid_response:
                 response.status_code = 200
             else:
                 response.status_code = 500
 
-            TokenRegenerator.validate_tokens(
+            result = TokenRegenerator.validate_tokens(
                 gtoken,
                 bullet_token,
                 nso,
@@ -169,22 +240,48 @@ class TestTokenRegenerator:
                 mock_bullet.assert_not_called()
             else:
                 mock_bullet.assert_called_once_with(
-                    nso, self.ftokens_url, "test_user_agent"
+                    nso, self.ftokens_url, "test_user_agent", gtoken=gtoken
                 )
 
+            if not (valid_gtoken and valid_bullet):
+                # Regenerated tokens are returned without probing SplatNet
+                nso.session.post.assert_not_called()
+                mock_all_tokens.assert_not_called()
+                assert result == TokenBundle(gtoken, bullet_token)
+                return
+
             mock_queries.query_header.assert_called_once_with(
                 bullet_token.value, "en-US", "test_user_agent"
             )
-            mock_queries.query_body.assert_called_once_with("HomeQuery")
-            mock_requests.post.assert_called_once_with(
+            mock_queries.get_query.assert_called_once_with("HomeQuery")
+            mock_queries.query_body_hash.assert_called_once_with(
+                mock_queries.get_query.return_value
+            )
+            nso.session.post.assert_called_once_with(
                 GRAPH_QL_REFERENCE_URL,
-                data=mock_queries.query_body.return_value,
+                data=mock_queries.query_body_hash.return_value,
                 headers=mock_queries.query_header.return_value,
                 cookies={"_gtoken": gtoken.value},
+                timeout=VALIDATION_TIMEOUT,
             )
             if valid_response:
                 mock_all_tokens.assert_not_called()
+                assert result == TokenBundle(gtoken, bullet_token)
             else:
                 mock_all_tokens.assert_called_once_with(
                     nso, self.ftokens_url, "test_user_agent"
                 )
+                assert result == mock_all_tokens.return_value
+
+    def test_home_query_body_cached(self) -> None:
+        _home_query_body.cache_clear()
+        with patch(base_regen_path + ".queries") as mock_queries:
+            mock_queries.query_body_hash.side_effect = lambda h: f"body_{h}"
+            assert _home_query_body("hash_1") == "body_hash_1"
+            assert _home_query_body("hash_1") == "body_hash_1"
+            mock_queries.query_body_hash.assert_called_once_with("hash_1")
+
+            # A new hash builds a new body
+            assert _home_query_body("hash_2") == "body_hash_2"
+            assert mock_queries.query_body_hash.call_count == 2
+        _home_query_body.cache_clear()
@@ -22,6 +22,7 @@ class TestToken:
         assert token.name == "test_name"
         assert token.timestamp == timestamp
         assert math.isclose(token.expiration, timestamp + 1e10)
+        assert not hasattr(token, "__dict__")
 
     @freezegun.freeze_time("2023-01-01 00:00:00")
     def test_properties(self):
@@ -37,9 +38,12 @@ class TestToken:
             assert token.time_left_str == "30m"
 
             frozen_time.tick(10 * 60 + 5)
-            assert token.time_left_str == "19m 55.0s"
+            assert token.time_left_str == "19m 55s"
 
-            frozen_time.tick(20 * 60)
+            frozen_time.tick(19 * 60 + 54.5)
+            assert token.time_left_str == "0s"
+
+            frozen_time.tick(1)
             assert token.time_left_str == "Expired"
 
     @freezegun.freeze_time("2023-01-01 00:00:00")
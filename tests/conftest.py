@@ -1,5 +1,15 @@
+import pytest
+
 pytest_plugins = [
     "tests.fixtures.json",
     "tests.fixtures.constants",
     "tests.fixtures.config",
 ]
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    # Keep the on-disk cache out of the user's home directory during tests
+    cache_dir = tmp_path / "sn3s_cache"
+    monkeypatch.setenv("SN3S_CACHE_DIR", str(cache_dir))
+    return cache_dir
@@ -1,3 +1,6 @@
+import json
+
+
 class MockResponse:
     def __init__(
         self,
@@ -29,6 +32,20 @@ class MockResponse:
         self.json_counter += 1
         return self._json
 
+    @property
+    def content(self):
+        if not self._text:
+            return json.dumps(self._json).encode()
+        return self._text.encode()
+
+    def iter_content(self, chunk_size: int = 1, decode_unicode: bool = False):
+        content = self.content
+        for i in range(0, len(content), chunk_size):
+            yield content[i : i + chunk_size]
+
+    def close(self):
+        pass
+
     @property
     def url(self):
         self.url_counter += 1
@@ -170,11 +187,16 @@ class MockLinearJSON:
     def __init__(self, *args, **kwargs) -> None:
         self._mocked = True
         self.stringify_calls = 0
+        self.header = ("test_headers",)
 
     def stringify(self, *args, **kwargs):
         self.stringify_calls += 1
         return ("test_headers", "test_data")
 
+    def stringify_chunks(self, *args, **kwargs):
+        yield "test_data_0"
+        yield "test_data_1"
+
 
 class MockPyArrowTable:
     def __init__(self, *args, **kwargs) -> None:
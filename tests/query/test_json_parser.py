@@ -1,9 +1,11 @@
+import hashlib
 import pathlib
 import random
 from unittest.mock import mock_open, patch
 
 import pytest
 
+from splatnet3_scraper.constants import WRITE_BUFFER_SIZE
 from splatnet3_scraper.query.json_parser import JSONParser, LinearJSON
 from tests.mock import MockLinearJSON, MockPyArrowTable
 
@@ -48,6 +50,13 @@ class TestLinearJSON:
             )
             mock_linearize.assert_called_once_with(test_object)
 
+    def test_hash(self):
+        header = ["test_key_0", "test_key_1"]
+        expected = hashlib.sha256(str(tuple(header)).encode()).hexdigest()
+        assert LinearJSON.hash(header) == expected
+        assert LinearJSON.hash(tuple(header)) == expected
+        assert LinearJSON(header, ["a", "b"]).hashed_header() == expected
+
     def test_delinearize(self):
         x_length = random.randint(10, 50)
         y_length = random.randint(5, 10)
@@ -236,6 +245,18 @@ class TestLinearJSON:
         assert linear_json.stringify() == (expected_header, expected_string)
         assert linear_json.stringify(include_header=False) == expected_string
 
+    def test_stringify_chunks(self):
+        header = ["test_header_0", "test_header_1"]
+        data = [[f"test_data_{i}", i] for i in range(5)]
+        linear_json = LinearJSON(header, data)
+        chunks = list(linear_json.stringify_chunks(chunk_size=2))
+        assert chunks == [
+            "test_data_0,0\ntest_data_1,1",
+            "test_data_2,2\ntest_data_3,3",
+            "test_data_4,4",
+        ]
+        assert "\n".join(chunks) == linear_json.stringify(include_header=False)
+
     def test_remove_columns(self):
         header = ["test_header_0", "test_header_1", "test_header_2"]
         data = [["test_data_0", "test_data_1", "test_data_2"]]
@@ -282,6 +303,28 @@ class TestJSONParser:
         assert linear_json.header == ("test_key",)
         assert linear_json.data == [["test_value_0"], ["test_value_1"]]
 
+    def test_to_linear_json_mixed_headers(self):
+        data = [
+            {"a": 1, "bb": 2},
+            {"a": 3, "ccc": 4},
+            {"a": 5, "bb": 6},
+            {"a": 7, "bb": 8, "ccc": 9},
+        ]
+        linear_json = JSONParser(data)._JSONParser__to_linear_json()
+
+        # Same result as appending the rows one at a time
+        expected = LinearJSON.from_json(data[0])
+        for row in data[1:]:
+            expected.append(LinearJSON.from_json(row))
+        assert linear_json == expected
+        assert linear_json.header == ["a", "bb", "ccc"]
+        assert linear_json.data == [
+            [1, 2, None],
+            [3, None, 4],
+            [5, 6, None],
+            [7, 8, 9],
+        ]
+
     def test_remove_columns(self):
         data = [
             {"test_key_0": "test_value_0", "test_key_1": "test_value_1"},
@@ -322,17 +365,25 @@ class TestJSONParser:
         with (
             patch("builtins.open", mock_open()) as mock_file,
             patch(json_parser_mangled + "__to_linear_json") as mock_linear_json,
-            patch(mock_path + ".MockLinearJSON.stringify") as mock_stringify,
         ):
             mock_linear_json.return_value = MockLinearJSON()
-            mock_stringify.return_value = (expected_header, expected_string)
             json_parser.to_csv("test_path")
             mock_file.assert_called_once_with(
-                "test_path", "w", encoding="utf-8"
+                "test_path", "w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE
             )
             mock_linear_json.assert_called_once()
-            mock_stringify.assert_called_once()
-            assert mock_file().write.call_count == 2
+            written = "".join(
+                call.args[0] for call in mock_file().write.call_args_list
+            )
+            assert written == "test_headers\ntest_data_0\ntest_data_1"
+
+        # Real data
+        with patch("builtins.open", mock_open()) as mock_file:
+            json_parser.to_csv("test_path")
+            written = "".join(
+                call.args[0] for call in mock_file().write.call_args_list
+            )
+            assert written == expected_header + "\n" + expected_string
 
     def test_to_json(self):
         data = [
@@ -348,7 +399,10 @@ class TestJSONParser:
         ):
             json_parser.to_json("test_path")
             mock_file.assert_called_once_with(
-                "test_path", mode="w", encoding="utf-8"
+                "test_path",
+                mode="w",
+                encoding="utf-8",
+                buffering=WRITE_BUFFER_SIZE,
             )
             mock_dump.assert_called_once_with(data, mock_file(), indent=4)
 
@@ -359,7 +413,10 @@ class TestJSONParser:
         ):
             json_parser.to_json("test_path", indent=2)
             mock_file.assert_called_once_with(
-                "test_path", mode="w", encoding="utf-8"
+                "test_path",
+                mode="w",
+                encoding="utf-8",
+                buffering=WRITE_BUFFER_SIZE,
             )
             mock_dump.assert_called_once_with(data, mock_file(), indent=2)
 
@@ -403,6 +460,27 @@ class TestJSONParser:
         }
         assert json_parser.data == [expected_json]
 
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_ndjson(self, use_orjson, tmp_path):
+        data = [
+            {"test_key_0": "test_value_0", "test_key_1": [1, 2]},
+            {"test_key_0": "tést_välue_2", "test_key_1": {"a": None}},
+        ]
+        path = str(tmp_path / "test.ndjson")
+        if use_orjson:
+            pytest.importorskip("orjson")
+            JSONParser(data).to_ndjson(path)
+            json_parser = JSONParser.from_ndjson(path)
+        else:
+            with patch(json_path + ".orjson", None):
+                JSONParser(data).to_ndjson(path)
+                json_parser = JSONParser.from_ndjson(path)
+
+        with open(path, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        assert len(lines) == len(data)
+        assert json_parser.data == data
+
     def test_automatic_type_conversion(self):
         test_values = [
             "",
@@ -1,12 +1,16 @@
+import gzip
+import json
 from unittest.mock import mock_open, patch
 
 import pytest
 from pytest_lazyfixture import lazy_fixture
 
+from splatnet3_scraper.constants import WRITE_BUFFER_SIZE
 from splatnet3_scraper.query.json_parser import JSONParser
 from splatnet3_scraper.query.responses import QueryResponse
 
 param = pytest.mark.parametrize
+responses_path = "splatnet3_scraper.query.responses"
 
 
 class TestQueryResponse:
@@ -52,6 +56,13 @@ class TestQueryResponse:
         response = QueryResponse(json_small)
         parser = response.parse_json()
         assert parser == JSONParser(json_small)
+        assert response.parse_json() is parser
+
+        # A parser whose rows were replaced is not reused
+        parser.remove_columns(list(json_small.keys())[:1])
+        new_parser = response.parse_json()
+        assert new_parser is not parser
+        assert new_parser == JSONParser(json_small)
 
     @param(
         "query",
@@ -119,6 +130,10 @@ class TestQueryResponse:
         )
         assert response["c", 0, "d"] == json_deep_nested_list["c"][0]["d"]
         assert response["c", 0, "e", "g", "h"] == 5
+        assert response["c", 0, "e"] == QueryResponse(
+            json_deep_nested_list["c"][0]["e"], metadata
+        )
+        assert response[()] is response
 
     @param(
         "data", [lazy_fixture("json_deep_nested"), [1, 2, 3]], ids=["D", "L"]
@@ -412,11 +427,38 @@ class TestQueryResponse:
             patch("builtins.open", mock_open()) as mock_file,
         ):
             response.to_json("test.json")
-            mock_file.assert_called_once_with(path, "w", encoding="utf-8")
+            mock_file.assert_called_once_with(
+                path, "w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE
+            )
             mock_dump.assert_called_once_with(
                 response.data, mock_file(), ensure_ascii=False, indent=4
             )
 
+        # Compact output without orjson
+        with (
+            patch("json.dump", return_value=None) as mock_dump,
+            patch("builtins.open", mock_open()) as mock_file,
+            patch(responses_path + ".orjson", None),
+        ):
+            response.to_json("test.json", indent=None)
+            mock_dump.assert_called_once_with(
+                response.data, mock_file(), ensure_ascii=False, indent=None
+            )
+
+    @param("indent", [None, 2], ids=["compact", "indent_2"])
+    def test_to_json_orjson(self, json_deep_nested: dict, indent, tmp_path):
+        pytest.importorskip("orjson")
+        response = QueryResponse(json_deep_nested)
+        path = tmp_path / "test.json"
+        with patch("json.dump") as mock_dump:
+            response.to_json(str(path), indent=indent)
+            response.to_gzipped_json(str(path) + ".gz", indent=indent)
+            mock_dump.assert_not_called()
+
+        assert json.loads(path.read_text("utf-8")) == json_deep_nested
+        with gzip.open(str(path) + ".gz", "rt", encoding="utf-8") as f:
+            assert json.load(f) == json_deep_nested
+
     def test_to_gzipped_json(self, json_deep_nested: dict):
         response = QueryResponse(json_deep_nested)
         path = "test.json.gz"
@@ -1,8 +1,10 @@
+import json
 from unittest.mock import MagicMock, patch
 
 import pytest
 
 from splatnet3_scraper.auth.exceptions import SplatNetException
+from splatnet3_scraper.query import handler as handler_module
 from splatnet3_scraper.query.handler import QueryHandler
 
 base_handler_path = "splatnet3_scraper.query.handler"
@@ -179,9 +181,10 @@ class TestSplatNetQueryHandler:
         invalid_response.status_code = 400
         valid_response.status_code = 200
         if response in ("200", "400"):
-            valid_response.json.return_value = {"data": {"test": "test"}}
+            response_json = {"data": {"test": "test"}}
         else:
-            valid_response.json.return_value = {"errors": ["test"]}
+            response_json = {"errors": ["test"]}
+        valid_response.content = json.dumps(response_json).encode()
 
         counter = 1 if response == "400" else 0
 
@@ -248,9 +251,10 @@ class TestSplatNetQueryHandler:
         invalid_response.status_code = 400
         valid_response.status_code = 200
         if response in ("200", "400"):
-            valid_response.json.return_value = {"data": {"test": "test"}}
+            response_json = {"data": {"test": "test"}}
         else:
-            valid_response.json.return_value = {"errors": ["test"]}
+            response_json = {"errors": ["test"]}
+        valid_response.content = json.dumps(response_json).encode()
 
         counter = 1 if response == "400" else 0
 
@@ -292,3 +296,29 @@ class TestSplatNetQueryHandler:
             else:
                 assert mock_raw_query.call_count == 2
                 config.regenerate_tokens.assert_called_once_with()
+
+    @pytest.mark.parametrize(
+        "use_orjson",
+        [True, False],
+        ids=["orjson", "json"],
+    )
+    def test_parse_response(self, use_orjson: bool) -> None:
+        response = MagicMock()
+        response.content = b'{"data": {"test": "test"}}'
+        response.json.return_value = {"data": {"test": "test"}}
+        parse_response = QueryHandler._QueryHandler__parse_response
+        with (
+            patch(query_response_path) as mock_query_response,
+            patch.object(
+                handler_module,
+                "orjson",
+                handler_module.orjson if use_orjson else None,
+            ),
+        ):
+            ret = parse_response(response)
+            mock_query_response.assert_called_once_with(data={"test": "test"})
+            assert ret == mock_query_response.return_value
+            if use_orjson:
+                response.json.assert_not_called()
+            else:
+                response.json.assert_called_once_with()
@@ -12,14 +12,18 @@ from splatnet3_scraper.utils import (
     delinearize_json,
     enumerate_all_paths,
     fallback_path,
+    get_cache_dir,
     get_fallback_hash_data,
     get_hash_data,
     get_splatnet_hashes,
     get_splatnet_version,
     get_ttl_hash,
+    hash_data,
     linearize_json,
     match_partial_path,
+    read_cache,
     retry,
+    write_cache,
 )
 from tests.mock import MockResponse
 
@@ -106,6 +110,65 @@ class TestRetry:
         assert mock_logger.call_count == 1
         assert count == 2
 
+    @mock.patch("logging.warning")
+    def test_reraises_last_exception(self, mock_logger: mock.MagicMock):
+        count = 0
+        call_on_fail = mock.MagicMock(__name__="call_on_fail")
+
+        @retry(times=2, exceptions=ValueError, call_on_fail=call_on_fail)
+        def test_func():
+            nonlocal count
+            count += 1
+            raise ValueError(f"attempt {count}")
+
+        with pytest.raises(ValueError, match="attempt 3"):
+            test_func()
+
+        assert count == 3
+        assert mock_logger.call_count == 2
+        assert call_on_fail.call_count == 2
+
+    @mock.patch("logging.warning")
+    @mock.patch("time.sleep")
+    @mock.patch("random.uniform", return_value=1.0)
+    def test_delays(
+        self,
+        mock_uniform: mock.MagicMock,
+        mock_sleep: mock.MagicMock,
+        mock_logger: mock.MagicMock,
+    ):
+        @retry(times=3, exceptions=ValueError, delays=(0.2, 0.5))
+        def test_func():
+            raise ValueError
+
+        with pytest.raises(ValueError):
+            test_func()
+
+        # The last delay is reused once the tuple runs out, and there is no
+        # sleep after the final attempt
+        assert mock_sleep.call_args_list == [
+            mock.call(0.2),
+            mock.call(0.5),
+            mock.call(0.5),
+        ]
+        assert mock_uniform.call_count == 3
+
+    @mock.patch("logging.warning")
+    def test_no_retries(self, mock_logger: mock.MagicMock):
+        count = 0
+
+        def test_func():
+            nonlocal count
+            count += 1
+            raise ValueError
+
+        assert retry(times=0, exceptions=ValueError)(test_func) is test_func
+        with pytest.raises(ValueError):
+            retry(times=0, exceptions=ValueError)(test_func)()
+
+        assert mock_logger.call_count == 0
+        assert count == 1
+
 
 class TestLinearizeJSON:
     @pytest.mark.parametrize(
@@ -144,6 +207,13 @@ class TestLinearizeJSON:
     def test_linearize_json(self, input, expected):
         assert linearize_json(input) == expected
 
+    def test_linearize_json_interned_keys(self):
+        # Keys shared by different shapes are the same string object
+        left_keys, _ = linearize_json({"a": {"b": 1}, "c": 2})
+        right_keys, _ = linearize_json({"a": {"b": 3, "d": 4}})
+        assert left_keys[0] == "a.b"
+        assert left_keys[0] is right_keys[0]
+
 
 class TestDelinearizeJSON:
     @pytest.mark.parametrize(
@@ -187,6 +257,17 @@ class TestDelinearizeJSON:
     def test_delinearize_json(self, input, expected):
         assert delinearize_json(*input) == expected
 
+    def test_delinearize_json_long_list(self):
+        # Indices past 9 must not be placed by the lexical order of the keys
+        data = {"a": list(range(12)), "b": [{"c": i} for i in range(12)]}
+        assert delinearize_json(*linearize_json(data)) == data
+
+    def test_delinearize_json_unordered_keys(self):
+        keys = ["c;1.e", "c", "c;1.d", "a", "c;0"]
+        values = [4, None, 3, 1, None]
+        expected = {"a": 1, "c": [None, {"d": 3, "e": 4}]}
+        assert delinearize_json(keys, values) == expected
+
 
 class TestEnumerateAllPaths:
     @pytest.mark.parametrize(
@@ -202,12 +283,19 @@ class TestEnumerateAllPaths:
                 lazy_fixture("json_deep_nested_list"),
                 lazy_fixture("json_deep_nested_list_keys"),
             ),
+            (
+                {"a": {}, "b": [[], {"c": 1}], "d": 2},
+                [("a",), ("b",), ("b", 0), ("b", 1), ("b", 1, "c"), ("d",)],
+            ),
+            ("not_a_container", []),
         ],
         ids=[
             "small",
             "nested",
             "nested_list",
             "deep_nested_list",
+            "empty_containers",
+            "scalar",
         ],
     )
     def test_enumerate_all_paths(self, input, expected):
@@ -243,6 +331,16 @@ class TestMatchPartialPath:
                 [("c", ":", "e"), (":", "d")],
                 [("c", 0, "e"), ("c", 1, "e"), ("c", 0, "d"), ("c", 1, "d")],
             ),
+            (
+                lazy_fixture("json_deep_nested_list"),
+                ("c", ":"),
+                [("c", 0), ("c", 1)],
+            ),
+            (
+                lazy_fixture("json_deep_nested_list"),
+                ("x", "h"),
+                [],
+            ),
         ],
         ids=[
             "nested_list",
@@ -250,6 +348,8 @@ class TestMatchPartialPath:
             "list_of_paths",
             "path_with_wildcard",
             "list_of_paths_with_wildcard",
+            "trailing_wildcard",
+            "no_match",
         ],
     )
     def test_match_partial_path(self, input, path, expected):
@@ -289,7 +389,7 @@ class TestHash:
     )
     def test_get_hash_data_explicit(self, args: tuple, expected_url: str):
         with mock.patch.object(
-            requests,
+            hash_data._session,
             "get",
             return_value=MockResponse(200, json=self.TEST_RESPONSE_JSON),
         ) as mock_get:
@@ -297,7 +397,30 @@ class TestHash:
                 self.TEST_HASH_MAP,
                 self.TEST_VERSION,
             )
-            mock_get.assert_called_once_with(expected_url)
+            mock_get.assert_called_once_with(
+                expected_url, timeout=hash_data.HASH_DATA_TIMEOUT
+            )
+
+    def test_get_hash_data_disk_cache(self):
+        with mock.patch.object(
+            hash_data._session,
+            "get",
+            return_value=MockResponse(200, json=self.TEST_RESPONSE_JSON),
+        ) as mock_get:
+            # Unique TTL hashes bypass the in-process cache
+            expected = (self.TEST_HASH_MAP, self.TEST_VERSION)
+            assert get_hash_data(None, -1) == expected
+            assert get_hash_data(None, -2) == expected
+            mock_get.assert_called_once_with(
+                GRAPH_QL_REFERENCE_URL, timeout=hash_data.HASH_DATA_TIMEOUT
+            )
+
+    def test_hash_data_session(self):
+        assert isinstance(hash_data._session, requests.Session)
+        assert hash_data._session.headers["Accept-Encoding"] == "gzip"
+        adapter = hash_data._session.get_adapter(GRAPH_QL_REFERENCE_URL)
+        assert adapter._pool_connections == 4
+        assert adapter._pool_maxsize == 8
 
     def test_get_ttl_hash(self):
         with freezegun.freeze_time(self.FROZEN_TIME) as frozen_datetime:
@@ -317,6 +440,14 @@ class TestHash:
             expected_fallback_data["version"],
         )
 
+    def test_get_fallback_hash_data_cached(self):
+        with mock.patch.object(hash_data, "_fallback_hash_data", None):
+            with mock.patch("builtins.open", wraps=open) as mock_open_fallback:
+                first = get_fallback_hash_data()
+                second = get_fallback_hash_data()
+                assert first is second
+                mock_open_fallback.assert_called_once_with(fallback_path, "r")
+
     def test_get_splatnet_hashes_success(self):
         with (
             mock.patch(
@@ -438,3 +569,34 @@ class TestHash:
             mock_get_hash_data.assert_called_once_with(None, ft)
             mock_get_fallback_hash_data.assert_called_once()
             assert mock_warning.call_count == 2
+
+
+class TestDiskCache:
+    def test_get_cache_dir(self, isolated_cache_dir, monkeypatch):
+        assert get_cache_dir() == isolated_cache_dir
+        monkeypatch.delenv("SN3S_CACHE_DIR")
+        monkeypatch.setenv("XDG_CACHE_HOME", "/xdg")
+        assert str(get_cache_dir()) == "/xdg/splatnet3_scraper"
+
+    def test_round_trip(self, isolated_cache_dir):
+        assert read_cache("test.json", 60) is None
+        write_cache("test.json", {"test_key": [1, 2]})
+        assert read_cache("test.json", 60) == {"test_key": [1, 2]}
+        assert list(isolated_cache_dir.iterdir()) == [
+            isolated_cache_dir / "test.json"
+        ]
+
+    def test_stale(self):
+        write_cache("test.json", {"test_key": "test_value"})
+        with freezegun.freeze_time(dt.datetime.now() + dt.timedelta(hours=1)):
+            assert read_cache("test.json", 60) is None
+
+    def test_corrupt(self, isolated_cache_dir):
+        isolated_cache_dir.mkdir()
+        (isolated_cache_dir / "test.json").write_text("{not json")
+        assert read_cache("test.json", 60) is None
+
+    def test_unserializable(self, isolated_cache_dir):
+        write_cache("test.json", {"test_key": object()})
+        assert read_cache("test.json", 60) is None
+        assert list(isolated_cache_dir.iterdir()) == []